@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import atexit
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
 import numpy as np
 from shiny import App, ui, render, reactive, req
 import refinitiv.data as rd
+from deviltongues.cache import FileCache
 import plotly.graph_objects as go
 from scipy import interpolate
 
@@ -19,6 +26,13 @@ def get_fourth_friday(d: datetime.date) -> datetime.date:
     return get_next_friday(d) + timedelta(weeks=3)
 
 
+# comparisons against a two-value categorical run on its integer codes
+_CALL_PUT_DTYPE = pd.CategoricalDtype(["Call", "Put"])
+# RIC stays a plain string: it is unique per contract, so a categorical would only add a lookup table.
+# StrikePrice stays float64: it becomes K in the parity maths, and float32 turns 412.3 into 412.2999877
+_CHAIN_DTYPES = {"RIC": str, "StrikePrice": "float64", "CallPutOption": _CALL_PUT_DTYPE}
+_PRICE_COLS = ["Bid", "Ask", "Last"]
+
 today = datetime.today().date()
 default_min_expiry = get_next_friday(today)
 default_max_expiry = today + timedelta(days=120)
@@ -30,8 +44,12 @@ def build_surface_df(df: pd.DataFrame, spot: float) -> pd.DataFrame:
     df["Ask"] = pd.to_numeric(df.get("Ask"), errors="coerce")
     df["Last"] = pd.to_numeric(df.get("Last"), errors="coerce")
 
-    df["mid"] = df[["Bid", "Ask"]].mean(axis=1)
-    df.loc[df["mid"].isna(), "mid"] = df["Last"]
+    bid = df["Bid"].to_numpy(dtype=np.float64)
+    ask = df["Ask"].to_numpy(dtype=np.float64)
+    mid = (bid + ask) * 0.5
+    # one-sided quotes keep the side that is there, as mean(axis=1) did; no quote at all falls back to Last
+    mid = np.where(np.isnan(mid), np.fmax(bid, ask), mid)
+    df["mid"] = np.where(np.isnan(mid), df["Last"].to_numpy(dtype=np.float64), mid)
 
     df["ExpiryDate"] = pd.to_datetime(df["ExpiryDate"])
     now = pd.Timestamp.now()
@@ -42,19 +60,17 @@ def build_surface_df(df: pd.DataFrame, spot: float) -> pd.DataFrame:
     return df[["RIC", "K", "T", "mid", "S", "StrikePrice", "ExpiryDate", "CallPutOption"]]
 
 
-def compute_implied_r(row):
-    try:
-        if row["T"] <= 0 or row["K"] <= 0:
-            return np.nan
-
-        numerator = row["S"] - (row["C_mid"] - row["P_mid"])
-        if numerator <= 0:
-            return np.nan
+def compute_implied_r(S, C, P, K, T) -> np.ndarray:
+    S, C, P, K, T = (np.asarray(a, dtype=np.float64) for a in (S, C, P, K, T))
+    numerator = S - (C - P)
+    valid = (T > 0) & (K > 0) & (numerator > 0)
 
-        r = -(1 / row["T"]) * np.log(numerator / row["K"])
-        return r
-    except:
-        return np.nan
+    r = np.full(numerator.shape, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # num/K sits next to 1 for any sane quote; log1p of the excess keeps more of the spread's digits
+        r[valid] = -np.log1p((numerator[valid] - K[valid]) / K[valid]) / T[valid]
+    r[~np.isfinite(r)] = np.nan
+    return r
 
 
 def get_strategy_summary(signal: str) -> str:
@@ -65,40 +81,66 @@ def get_strategy_summary(signal: str) -> str:
     return signal
 
 
+# static copy for the strategy panel; only the numbers are filled in per row
+_STRATEGY_TEMPLATES = {
+    "Sell Call+Buy Put+Buy Stock": {
+        "type": "Reverse Conversion Arbitrage",
+        "summary": "The synthetic stock (long call + short put) is overpriced relative to actual stock.",
+        "positions": (
+            "• SELL Call @ ${K:.0f} strike for ${C_mid:.2f}",
+            "• BUY Put @ ${K:.0f} strike for ${P_mid:.2f}",
+            "• BUY underlying stock @ ${S:.2f}",
+        ),
+        "rationale": "The implied rate ({implied_pct:.2f}%) exceeds the risk-free rate by {diff_pct:.2f}%, indicating mispricing.",
+        "profit": "Net credit of ${option_credit:.2f} + dividend yield over {days:.0f} days",
+        "risk": "• Execution risk across 3 legs\n• Pin risk at expiration\n• Early assignment on short call\n• Transaction costs may erode profit",
+        "recommendation": (
+            0.5,
+            "Execute if net arbitrage exceeds 0.5% annualized after costs.",
+            "Profit margin may be too thin after transaction costs.",
+        ),
+    },
+    "Buy Call+Sell Put+Short Stock": {
+        "type": "Conversion Arbitrage",
+        "summary": "The synthetic stock (long call + short put) is underpriced relative to actual stock.",
+        "positions": (
+            "• BUY Call @ ${K:.0f} strike for ${C_mid:.2f}",
+            "• SELL Put @ ${K:.0f} strike for ${P_mid:.2f}",
+            "• SELL (short) underlying stock @ ${S:.2f}",
+        ),
+        "rationale": "The implied rate ({implied_pct:.2f}%) is below the risk-free rate by {diff_pct:.2f}%, indicating mispricing.",
+        "profit": "Net credit of ${stock_credit:.2f} + interest earned over {days:.0f} days",
+        "risk": "• Requires margin for short stock\n• Hard to borrow costs\n• Dividend risk on short stock\n• Early assignment on short put\n• Transaction costs",
+        "recommendation": (
+            1.0,
+            "Execute if net arbitrage exceeds 1% annualized after costs, and stock is easy to borrow.",
+            "Consider borrowing costs and margin requirements before executing.",
+        ),
+    },
+}
+
+
 def get_strategy_details(row) -> dict:
     strategy_type = get_strategy_summary(row['signal'])
-    r_diff_pct = row['r_diff'] * 100
+    tpl = _STRATEGY_TEMPLATES.get(strategy_type, _STRATEGY_TEMPLATES["Buy Call+Sell Put+Short Stock"])
+    diff_pct = abs(row['r_diff'] * 100)
 
-    if strategy_type == "Sell Call+Buy Put+Buy Stock":
-        return {
-            "type": "Reverse Conversion Arbitrage",
-            "summary": "The synthetic stock (long call + short put) is overpriced relative to actual stock.",
-            "positions": [
-                f"• SELL Call @ ${row['K']:.0f} strike for ${row['C_mid']:.2f}",
-                f"• BUY Put @ ${row['K']:.0f} strike for ${row['P_mid']:.2f}",
-                f"• BUY underlying stock @ ${row['S']:.2f}"
-            ],
-            "rationale": f"The implied rate ({row['implied_r'] * 100:.2f}%) exceeds the risk-free rate by {abs(r_diff_pct):.2f}%, indicating mispricing.",
-            "profit": f"Net credit of ${row['C_mid'] - row['P_mid']:.2f} + dividend yield over {row['T'] * 365:.0f} days",
-            "risk": "• Execution risk across 3 legs\n• Pin risk at expiration\n• Early assignment on short call\n• Transaction costs may erode profit",
-            "recommendation": "Execute if net arbitrage exceeds 0.5% annualized after costs." if abs(
-                r_diff_pct) > 0.5 else "Profit margin may be too thin after transaction costs."
-        }
-    else:
-        return {
-            "type": "Conversion Arbitrage",
-            "summary": "The synthetic stock (long call + short put) is underpriced relative to actual stock.",
-            "positions": [
-                f"• BUY Call @ ${row['K']:.0f} strike for ${row['C_mid']:.2f}",
-                f"• SELL Put @ ${row['K']:.0f} strike for ${row['P_mid']:.2f}",
-                f"• SELL (short) underlying stock @ ${row['S']:.2f}"
-            ],
-            "rationale": f"The implied rate ({row['implied_r'] * 100:.2f}%) is below the risk-free rate by {abs(r_diff_pct):.2f}%, indicating mispricing.",
-            "profit": f"Net credit of ${row['S'] - row['K']:.2f} + interest earned over {row['T'] * 365:.0f} days",
-            "risk": "• Requires margin for short stock\n• Hard to borrow costs\n• Dividend risk on short stock\n• Early assignment on short put\n• Transaction costs",
-            "recommendation": "Execute if net arbitrage exceeds 1% annualized after costs, and stock is easy to borrow." if abs(
-                r_diff_pct) > 1 else "Consider borrowing costs and margin requirements before executing."
-        }
+    fields = dict(
+        K=row['K'], S=row['S'], C_mid=row['C_mid'], P_mid=row['P_mid'],
+        implied_pct=row['implied_r'] * 100, diff_pct=diff_pct, days=row['T'] * 365,
+        option_credit=row['C_mid'] - row['P_mid'], stock_credit=row['S'] - row['K'],
+    )
+    cutoff, go_text, hold_text = tpl["recommendation"]
+
+    return {
+        "type": tpl["type"],
+        "summary": tpl["summary"],
+        "positions": [p.format(**fields) for p in tpl["positions"]],
+        "rationale": tpl["rationale"].format(**fields),
+        "profit": tpl["profit"].format(**fields),
+        "risk": tpl["risk"],
+        "recommendation": go_text if diff_pct > cutoff else hold_text,
+    }
 
 
 def analyze_arbitrage(surface_df: pd.DataFrame, risk_free_rate: float = 0.05, threshold: float = 0.005):
@@ -113,14 +155,48 @@ def analyze_arbitrage(surface_df: pd.DataFrame, risk_free_rate: float = 0.05, th
 
     merged["C_mid"] = merged["mid_call"]
     merged["P_mid"] = merged["mid_put"]
-    merged["implied_r"] = merged.apply(compute_implied_r, axis=1)
+    merged["implied_r"] = compute_implied_r(
+        merged["S"], merged["C_mid"], merged["P_mid"], merged["K"], merged["T"]
+    )
     merged["r_diff"] = merged["implied_r"] - risk_free_rate
 
-    merged["signal"] = None
-    merged.loc[merged["r_diff"] > threshold, "signal"] = "Sell synthetic, buy stock"
-    merged.loc[merged["r_diff"] < -threshold, "signal"] = "Buy synthetic, short stock"
+    # one pass over r_diff for both sides; "buy" wins a tie, as it did when it was assigned last
+    r_diff = merged["r_diff"].to_numpy()
+    buy = r_diff < -threshold
+    keep = buy | (r_diff > threshold)
+
+    return merged[keep].assign(
+        signal=np.where(buy[keep], "Buy synthetic, short stock", "Sell synthetic, buy stock")
+    )
+
+
+def bin_surface(K_vals: np.ndarray, T_vals: np.ndarray, r_vals: np.ndarray):
+    K_axis = np.unique(K_vals)
+    T_axis = np.unique(T_vals)
+    ik = np.searchsorted(K_axis, K_vals)
+    it = np.searchsorted(T_axis, T_vals)
+
+    # average duplicate (K, T) points in one unbuffered scatter pass
+    acc = np.zeros((len(T_axis), len(K_axis)))
+    cnt = np.zeros_like(acc)
+    np.add.at(acc, (it, ik), r_vals)
+    np.add.at(cnt, (it, ik), 1.0)
+    grid = np.where(cnt > 0, acc / np.maximum(cnt, 1), np.nan)
+
+    return K_axis, T_axis, grid
+
 
-    return merged[merged["signal"].notna()]
+def interp_surface(K_axis: np.ndarray, T_axis: np.ndarray, grid: np.ndarray,
+                   K_q: np.ndarray, T_q: np.ndarray) -> np.ndarray:
+    # bilinear weights on the regular (T, K) grid, evaluated for every query point at once
+    ik = np.clip(np.searchsorted(K_axis, K_q, side="right") - 1, 0, len(K_axis) - 2)
+    it = np.clip(np.searchsorted(T_axis, T_q, side="right") - 1, 0, len(T_axis) - 2)
+    wk = (K_q - K_axis[ik]) / (K_axis[ik + 1] - K_axis[ik])
+    wt = (T_q - T_axis[it]) / (T_axis[it + 1] - T_axis[it])
+
+    lower = (1 - wk) * grid[it, ik] + wk * grid[it, ik + 1]
+    upper = (1 - wk) * grid[it + 1, ik] + wk * grid[it + 1, ik + 1]
+    return (1 - wt) * lower + wt * upper
 
 
 def calculate_execution_costs(row, contracts, commission, slippage_pct, risk_free_rate):
@@ -222,7 +298,124 @@ def calculate_execution_costs(row, contracts, commission, slippage_pct, risk_fre
     }
 
 
+# ---------- session ----------
+# one Refinitiv session per process; Shiny sessions share its connection
+rd.open_session()
+atexit.register(rd.close_session)
+
+
+# ---------- workers ----------
+# shared across sessions so each fetch doesn't pay thread start-up
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# contract listings barely move intraday; quotes go stale fast
+_CACHE = FileCache(Path(__file__).with_name(".cache"))
+_CHAIN_TTL = 900
+_QUOTE_TTL = 30
+# a rescan inside the quote TTL would only get the same cached spot and quotes back, so it reuses the chain on screen
+_RESCAN_DEBOUNCE = timedelta(seconds=_QUOTE_TTL)
+
+
+# small in-process LRU in front of the disk cache, so flipping between recent filters skips the unpickle
+_MEMO = OrderedDict()
+_MEMO_SIZE = 32
+_MEMO_LOCK = threading.Lock()
+
+
+def _cached_call(key, ttl, fn, *args, **kwargs):
+    now = time.monotonic()
+    with _MEMO_LOCK:
+        hit = _MEMO.get(key)
+        if hit is not None and hit[0] > now:
+            _MEMO.move_to_end(key)
+            return hit[1]
+
+    value = _CACHE.get(key)
+    if value is not None:
+        return value
+    return _cache_put(key, ttl, fn(*args, **kwargs))
+
+
+def _cache_put(key, ttl, value):
+    _CACHE.set(key, value, ttl=ttl)
+
+    # only fresh results go in memory, so an entry never outlives its disk TTL
+    with _MEMO_LOCK:
+        _MEMO[key] = (time.monotonic() + ttl, value)
+        _MEMO.move_to_end(key)
+        if len(_MEMO) > _MEMO_SIZE:
+            _MEMO.popitem(last=False)
+    return value
+
+
+# ---------- surface figure ----------
+_SURFACE_HOVER = (
+    '<b>Strike:</b> $%{x:.0f}<br>'
+    '<b>Days to Expiry:</b> %{y:.1f}<br>'
+    '<b>Implied r:</b> %{z:.2f}% ann<br>'
+    '<extra></extra>'
+)
+
+# Deep-blue styling for Plotly
+_SURFACE_LAYOUT = dict(
+    title="Implied Risk-Free Rate Surface",
+    scene=dict(
+        xaxis_title="Strike Price ($)",
+        yaxis_title="Time to Expiry (Days)",
+        zaxis_title="Implied r, % ann",
+        camera=dict(eye=dict(x=1.5, y=1.5, z=1.3)),
+        xaxis=dict(tickprefix="$"),
+        zaxis=dict(ticksuffix="%"),
+        bgcolor="#0f1e33",
+    ),
+    template="plotly_dark",
+    paper_bgcolor="#0b1220",
+    font=dict(color="#e8eefc"),
+    height=600,
+    margin=dict(l=0, r=0, t=40, b=0)
+)
+
+# built and validated once; renders only swap the surface data in
+_SURFACE_FIG = go.Figure(data=[go.Surface(
+    colorscale='Viridis',
+    colorbar=dict(title="Implied r, % ann"),
+    hovertemplate=_SURFACE_HOVER,
+)])
+_SURFACE_FIG.update_layout(**_SURFACE_LAYOUT)
+_SURFACE_FIG_LOCK = threading.Lock()
+
+
 # ---------- UI ----------
+# attribute dicts shared by the static layout and the per-render calculator tree
+DATA_ROW = {"class": "data-row"}
+DATA_VALUE = {"class": "data-value"}
+SECTION_TITLE = {"class": "section-title"}
+CONTROL_SECTION = {"class": "control-section"}
+POSITIONS_BREAKDOWN = {"class": "positions-breakdown"}
+
+# empty states never change, so build them once and hand out the same tags
+_EMPTY_STRATEGY = ui.div(
+    {"class": "empty-state"},
+    "Click on a row above to see detailed strategy breakdown"
+)
+_EMPTY_CALCULATOR = ui.div(
+    {"class": "empty-state"},
+    ui.h5("No Strategy Selected"),
+    ui.p("Please go to the 'Analysis' tab and click on a row to select a strategy for calculation."),
+)
+_EMPTY_SURFACE_NO_CHAIN = ui.div(
+    {"class": "empty-state"},
+    ui.h5("No Data Available"),
+    ui.p("Please scan options first by clicking 'SCAN OPTIONS CHAIN' in the Market Data tab."),
+)
+_EMPTY_SURFACE_NO_ARB = ui.div(
+    {"class": "empty-state"},
+    ui.h5("No Arbitrage Data"),
+    ui.p("Click 'ANALYZE ARBITRAGE' in the Analysis tab to generate the surface."),
+)
+_EMPTY_SURFACE_SPARSE = ui.div({"class": "empty-state"}, "Insufficient data points for 3D surface. Need more strike/expiry combinations.")
+_EMPTY_SURFACE_FLAT = ui.div({"class": "empty-state"}, "Need at least 2 different strikes and 2 different expiries for surface plot.")
+
 app_ui = ui.page_navbar(
     ui.nav_panel(
         "Home",
@@ -348,8 +541,8 @@ app_ui = ui.page_navbar(
             ui.div(
                 {"class": "control-grid"},
                 ui.div(
-                    {"class": "control-section"},
-                    ui.h3("1. Select Underlying", {"class": "section-title"}),
+                    CONTROL_SECTION,
+                    ui.h3("1. Select Underlying", SECTION_TITLE),
                     ui.input_selectize(
                         "underlying_ric",
                         "Underlying Asset RIC",
@@ -371,8 +564,8 @@ app_ui = ui.page_navbar(
                     )
                 ),
                 ui.div(
-                    {"class": "control-section"},
-                    ui.h3("2. Configure Options Chain", {"class": "section-title"}),
+                    CONTROL_SECTION,
+                    ui.h3("2. Configure Options Chain", SECTION_TITLE),
                     ui.div(
                         {"class": "input-row"},
                         ui.input_numeric("min_strike", "Min Strike", value=300),
@@ -391,7 +584,7 @@ app_ui = ui.page_navbar(
             ),
             ui.div(
                 {"class": "data-section"},
-                ui.h3("Options Chain Data", {"class": "section-title"}),
+                ui.h3("Options Chain Data", SECTION_TITLE),
                 ui.output_data_frame("options_table"),
             ),
         ),
@@ -404,8 +597,8 @@ app_ui = ui.page_navbar(
             ui.div(
                 {"class": "analysis-controls"},
                 ui.div(
-                    {"class": "control-section"},
-                    ui.h3("Analysis Parameters", {"class": "section-title"}),
+                    CONTROL_SECTION,
+                    ui.h3("Analysis Parameters", SECTION_TITLE),
                     ui.input_numeric("risk_free_rate", "Risk-Free Rate (%)", value=5.0, step=0.1),
                     ui.input_numeric("arb_threshold", "Arbitrage Threshold (%)", value=0.5, step=0.1),
                     ui.input_action_button(
@@ -415,7 +608,7 @@ app_ui = ui.page_navbar(
             ),
             ui.div(
                 {"class": "data-section"},
-                ui.h3("Detected Opportunities", {"class": "section-title"}),
+                ui.h3("Detected Opportunities", SECTION_TITLE),
                 ui.output_text("arb_summary"),
                 ui.output_data_frame("arbitrage_table"),
                 ui.output_ui("strategy_details"),
@@ -454,15 +647,13 @@ app_ui = ui.page_navbar(
 
 # ---------- server ----------
 def server(input, output, session):
-    rd.open_session()
-    session.on_ended(rd.close_session)
-
     spot_price_data = reactive.Value(None)
     exchange_time_data = reactive.Value(None)
     option_data = reactive.Value(None)
     surface_data = reactive.Value(None)
     arbitrage_data = reactive.Value(None)
     selected_arb_row = reactive.Value(None)
+    last_chain_fetch = reactive.Value(None)
 
     calc_contracts = reactive.Value(10)
     calc_commission = reactive.Value(5.0)
@@ -502,7 +693,8 @@ def server(input, output, session):
         fetch_time = datetime.now()
 
         try:
-            df = rd.get_data(ric, fields=["TR.PriceClose"])
+            # an explicit refresh always goes to the feed; the fresh spot then replaces the cached one for later scans
+            df = _cache_put((ric, "spot"), _QUOTE_TTL, rd.get_data(ric, fields=["TR.PriceClose"]))
             spot_price_data.set(df["Price Close"].iloc[0])
             exchange_time_data.set(fetch_time.strftime("%Y-%m-%d %H:%M:%S"))
         except Exception as e:
@@ -529,32 +721,71 @@ def server(input, output, session):
 
         fetch_time = datetime.now()
 
+        # coerce once at the boundary so the search DSL sees "300", not "300.0"
+        min_strike = math.floor(input.min_strike())
+        max_strike = math.ceil(input.max_strike())
+        min_expiry = input.min_expiry()
+        max_expiry = input.max_expiry()
+
+        # an inverted window can only come back empty; skip the round trip
+        if min_strike < 0 or min_strike >= max_strike or min_expiry >= max_expiry:
+            option_data.set(pd.DataFrame(columns=["RIC", "CallPutOption", "StrikePrice", "ExpiryDate"]))
+            surface_data.set(None)
+            last_chain_fetch.set(None)  # the table no longer shows the last fetched chain
+            return
+
+        # a repeat click on the same window inside the debounce reuses the chain already shown
+        key = (ric, min_strike, max_strike, min_expiry, max_expiry, input.top_options())
+        last = last_chain_fetch.get()
+        if (last is not None and last[0] == key and option_data.get() is not None
+                and fetch_time - last[1] < _RESCAN_DEBOUNCE):
+            return
+
         filter_str = (
             "( SearchAllCategoryv2 eq 'Options' and "
-            f"(ExpiryDate gt {input.min_expiry()} and ExpiryDate lt {input.max_expiry()}) and "
-            f"(StrikePrice ge {input.min_strike()} and StrikePrice le {input.max_strike()}) and "
+            f"(ExpiryDate gt {min_expiry.isoformat()} and ExpiryDate lt {max_expiry.isoformat()}) and "
+            f"(StrikePrice ge {min_strike:d} and StrikePrice le {max_strike:d}) and "
             "ExchangeName xeq 'OPRA' and "
             f"(UnderlyingQuoteRIC eq '{ric}'))"
         )
 
-        chain = rd.discovery.search(
+        # refresh the spot alongside the chain search; the two round trips are independent
+        fut_spot = _EXECUTOR.submit(
+            _cached_call, (ric, "spot"), _QUOTE_TTL, rd.get_data, ric, fields=["TR.PriceClose"]
+        )
+        fut_chain = _EXECUTOR.submit(
+            _cached_call, (ric, "chain") + key[1:], _CHAIN_TTL,
+            rd.discovery.search,
             view=rd.discovery.Views.EQUITY_QUOTES,
             top=input.top_options(),
             filter=filter_str,
             select="RIC,CallPutOption,StrikePrice,ExpiryDate",
         )
 
+        try:
+            spot = fut_spot.result()["Price Close"].iloc[0]
+            spot_price_data.set(spot)
+        except Exception as e:
+            print(f"Error refreshing spot price: {e}")
+
+        chain = fut_chain.result()
+
         if chain.empty:
             option_data.set(chain)
             surface_data.set(None)
+            last_chain_fetch.set(None)
             exchange_time_data.set(fetch_time.strftime("%Y-%m-%d %H:%M:%S"))
             return
 
-        chain["RIC"] = chain["RIC"].astype(str)
+        # narrower columns mean less to merge here and to serialise to the browser
+        chain = chain.astype({c: t for c, t in _CHAIN_DTYPES.items() if c in chain.columns})
+        if "ExpiryDate" in chain.columns:
+            chain["ExpiryDate"] = pd.to_datetime(chain["ExpiryDate"]).astype("datetime64[s]")
 
-        raw_price = rd.get_data(
-            universe=chain["RIC"].tolist(),
-            fields=["CF_BID", "CF_ASK", "CF_LAST"],
+        rics = chain["RIC"].tolist()
+        raw_price = _cached_call(
+            (ric, "quotes", tuple(rics)), _QUOTE_TTL,
+            rd.get_data, universe=rics, fields=["CF_BID", "CF_ASK", "CF_LAST"],
         ).reset_index()
 
         candidate_cols = ["RIC", "Instrument", "ric", "instrument", "index"]
@@ -573,15 +804,17 @@ def server(input, output, session):
                 "CF_ASK": "Ask",
                 "CF_LAST": "Last",
             }
-        )[["RIC", "Bid", "Ask", "Last"]]
+        ).reindex(columns=["RIC", *_PRICE_COLS])  # a field the feed leaves out comes back as NaN
 
         price_df["RIC"] = price_df["RIC"].astype(str)
+        price_df[_PRICE_COLS] = price_df[_PRICE_COLS].apply(pd.to_numeric, errors="coerce")
 
         merged = chain.merge(price_df, on="RIC", how="left")
         option_data.set(merged)
 
         surf = build_surface_df(merged, spot)
         surface_data.set(surf)
+        last_chain_fetch.set((key, fetch_time))
 
         exchange_time_data.set(fetch_time.strftime("%Y-%m-%d %H:%M:%S"))
 
@@ -596,7 +829,7 @@ def server(input, output, session):
     def options_table():
         df = option_data.get()
         req(df is not None)
-        return df
+        return render.DataGrid(df, width="100%", summary=False)
 
     @reactive.effect
     @reactive.event(input.analyze_arb)
@@ -616,19 +849,20 @@ def server(input, output, session):
         df = arbitrage_data.get()
         req(df is not None and not df.empty)
 
-        display_df = df.copy()
-        display_df["Strategy"] = display_df["signal"].apply(get_strategy_summary)
-        display_df = display_df[["K", "T", "ExpiryDate", "Strategy", "implied_r", "r_diff", "C_mid", "P_mid"]]
-
-        display_df["T"] = display_df["T"].apply(lambda x: f"{x:.4f}")
-        display_df["implied_r"] = display_df["implied_r"].apply(lambda x: f"{x * 100:.2f}%")
-        display_df["r_diff"] = display_df["r_diff"].apply(lambda x: f"{x * 100:.2f}%")
-        display_df["C_mid"] = display_df["C_mid"].apply(lambda x: f"${x:.2f}")
-        display_df["P_mid"] = display_df["P_mid"].apply(lambda x: f"${x:.2f}")
-        display_df["ExpiryDate"] = pd.to_datetime(display_df["ExpiryDate"]).dt.strftime('%Y-%m-%d')
-        display_df["K"] = display_df["K"].apply(lambda x: f"${x:.0f}")
-
-        display_df.columns = ["Strike", "Years", "Expiry", "Strategy", "Implied r", "Rate Diff", "Call", "Put"]
+        # format whole columns at once; the strategy label is only resolved per distinct signal
+        signals = df["signal"]
+        strategies = {s: get_strategy_summary(s) for s in signals.unique()}
+
+        display_df = pd.DataFrame({
+            "Strike": np.char.mod("$%.0f", df["K"].to_numpy()),
+            "Years": np.char.mod("%.4f", df["T"].to_numpy()),
+            "Expiry": df["ExpiryDate"].dt.strftime('%Y-%m-%d').to_numpy(),
+            "Strategy": signals.map(strategies).to_numpy(),
+            "Implied r": np.char.mod("%.2f%%", df["implied_r"].to_numpy() * 100),
+            "Rate Diff": np.char.mod("%.2f%%", df["r_diff"].to_numpy() * 100),
+            "Call": np.char.mod("$%.2f", df["C_mid"].to_numpy()),
+            "Put": np.char.mod("$%.2f", df["P_mid"].to_numpy()),
+        })
 
         return render.DataGrid(
             display_df,
@@ -645,18 +879,20 @@ def server(input, output, session):
         else:
             selected_arb_row.set(None)
 
-    @render.ui
-    def strategy_details():
+    @reactive.calc
+    def _selected_row():
         row_idx = selected_arb_row.get()
         df = arbitrage_data.get()
-
         if row_idx is None or df is None or df.empty:
-            return ui.div(
-                {"class": "empty-state"},
-                "Click on a row above to see detailed strategy breakdown"
-            )
+            return None
+        return df.iloc[row_idx]
+
+    @render.ui
+    def strategy_details():
+        row = _selected_row()
+        if row is None:
+            return _EMPTY_STRATEGY
 
-        row = df.iloc[row_idx]
         details = get_strategy_details(row)
 
         return ui.div(
@@ -712,17 +948,9 @@ def server(input, output, session):
 
     @render.ui
     def calculator_interface():
-        row_idx = selected_arb_row.get()
-        df = arbitrage_data.get()
-
-        if row_idx is None or df is None or df.empty:
-            return ui.div(
-                {"class": "empty-state"},
-                ui.h5("No Strategy Selected"),
-                ui.p("Please go to the 'Analysis' tab and click on a row to select a strategy for calculation."),
-            )
-
-        row = df.iloc[row_idx]
+        row = _selected_row()
+        if row is None:
+            return _EMPTY_CALCULATOR
 
         _ = calc_trigger.get()
 
@@ -739,8 +967,8 @@ def server(input, output, session):
             ui.div(
                 {"class": "calculator-inputs"},
                 ui.div(
-                    {"class": "control-section"},
-                    ui.h3("Selected Strategy", {"class": "section-title"}),
+                    CONTROL_SECTION,
+                    ui.h3("Selected Strategy", SECTION_TITLE),
                     ui.div(
                         {"class": "strategy-badge"},
                         results['strategy_type']
@@ -749,54 +977,54 @@ def server(input, output, session):
                         {"class": "market-data-display"},
                         ui.h4("Market Data (Live)"),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Strike (K):"),
-                            ui.span(f"${results['strike']:.2f}", {"class": "data-value"}),
+                            ui.span(f"${results['strike']:.2f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Spot (S):"),
-                            ui.span(f"${results['spot']:.2f}", {"class": "data-value"}),
+                            ui.span(f"${results['spot']:.2f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Call Mid:"),
-                            ui.span(f"${results['call_mid']:.3f}", {"class": "data-value"}),
+                            ui.span(f"${results['call_mid']:.3f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Put Mid:"),
-                            ui.span(f"${results['put_mid']:.3f}", {"class": "data-value"}),
+                            ui.span(f"${results['put_mid']:.3f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Days to Expiry:"),
-                            ui.span(f"{results['days_to_expiry']:.0f} days", {"class": "data-value"}),
+                            ui.span(f"{results['days_to_expiry']:.0f} days", DATA_VALUE),
                         ),
                     ),
                     ui.div(
                         {"class": "rate-analysis-display"},
                         ui.h4("Rate Analysis"),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Implied Rate:"),
                             ui.span(f"{results['implied_rate'] * 100:.2f}%", {"class": "data-value highlight"}),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Benchmark Rate:"),
-                            ui.span(f"{results['risk_free_rate'] * 100:.2f}%", {"class": "data-value"}),
+                            ui.span(f"{results['risk_free_rate'] * 100:.2f}%", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Rate Diff:"),
                             ui.span(f"{results['rate_diff'] * 100:.2f}%", {"class": "data-value profit" if results['rate_diff'] > 0 else "data-value"}),
                         ),
                     ),
                 ),
                 ui.div(
-                    {"class": "control-section"},
-                    ui.h3("Input Parameters", {"class": "section-title"}),
+                    CONTROL_SECTION,
+                    ui.h3("Input Parameters", SECTION_TITLE),
                     ui.input_numeric("contracts", "Number of Contracts", value=contracts, min=1, max=1000),
                     ui.input_numeric("commission_per_leg", "Commission per Leg ($)", value=commission, min=0, step=0.5),
                     ui.input_numeric("slippage_pct", "Expected Slippage (%)", value=slippage_pct, min=0, max=5, step=0.1),
@@ -806,32 +1034,32 @@ def server(input, output, session):
             ui.div(
                 {"class": "calculator-results"},
                 ui.div(
-                    {"class": "control-section"},
-                    ui.h3("Position Values", {"class": "section-title"}),
+                    CONTROL_SECTION,
+                    ui.h3("Position Values", SECTION_TITLE),
                     ui.div(
-                        {"class": "positions-breakdown"},
+                        POSITIONS_BREAKDOWN,
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span(f"Call Position ({contracts} contracts @ ${results['call_mid']:.2f}):"),
-                            ui.span(f"${results['call_value']:,.2f}", {"class": "data-value"}),
+                            ui.span(f"${results['call_value']:,.2f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span(f"Put Position ({contracts} contracts @ ${results['put_mid']:.2f}):"),
-                            ui.span(f"${results['put_value']:,.2f}", {"class": "data-value"}),
+                            ui.span(f"${results['put_value']:,.2f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span(f"Stock Position ({contracts * 100} shares @ ${results['spot']:.2f}):"),
-                            ui.span(f"${results['stock_value']:,.2f}", {"class": "data-value"}),
+                            ui.span(f"${results['stock_value']:,.2f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Total Commission (3 legs):"),
                             ui.span(f"-${results['total_commission']:,.2f}", {"class": "data-value warning"}),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span(f"Slippage ({slippage_pct}%):"),
                             ui.span(f"-${results['slippage_cost']:,.2f}", {"class": "data-value warning"}),
                         ),
@@ -844,10 +1072,10 @@ def server(input, output, session):
                     )
                 ),
                 ui.div(
-                    {"class": "control-section"},
-                    ui.h3("Implied Rate Carry (Before Costs)", {"class": "section-title"}),
+                    CONTROL_SECTION,
+                    ui.h3("Implied Rate Carry (Before Costs)", SECTION_TITLE),
                     ui.div(
-                        {"class": "positions-breakdown"},
+                        POSITIONS_BREAKDOWN,
                         ui.div(
                             {"class": "data-row highlight-row"},
                             ui.span("Theoretical Arbitrage Profit:"),
@@ -860,44 +1088,44 @@ def server(input, output, session):
                         ),
                         ui.tags.hr({"class": "divider"}),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Capital Employed:"),
-                            ui.span(f"${results['capital_employed']:,.2f}", {"class": "data-value"}),
+                            ui.span(f"${results['capital_employed']:,.2f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Required Margin:"),
-                            ui.span(f"${results['required_margin']:,.2f}", {"class": "data-value"}),
+                            ui.span(f"${results['required_margin']:,.2f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Return on Capital (ROI):"),
-                            ui.span(f"{results['roi']:.2f}%", {"class": "data-value"}),
+                            ui.span(f"{results['roi']:.2f}%", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Annualized Return:"),
                             ui.span(f"{results['annualized_return']:.2f}%", {"class": "data-value profit large"}),
                         ),
                     )
                 ),
                 ui.div(
-                    {"class": "control-section"},
-                    ui.h3("Scenario Analysis", {"class": "section-title"}),
+                    CONTROL_SECTION,
+                    ui.h3("Scenario Analysis", SECTION_TITLE),
                     ui.div(
-                        {"class": "positions-breakdown"},
+                        POSITIONS_BREAKDOWN,
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Best Case (+30%):"),
                             ui.span(f"${results['best_case']:,.2f}", {"class": "data-value profit"}),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Expected Case:"),
-                            ui.span(f"${results['theoretical_profit']:,.2f}", {"class": "data-value"}),
+                            ui.span(f"${results['theoretical_profit']:,.2f}", DATA_VALUE),
                         ),
                         ui.div(
-                            {"class": "data-row"},
+                            DATA_ROW,
                             ui.span("Worst Case (-30%):"),
                             ui.span(f"${results['worst_case']:,.2f}", {"class": "data-value warning"}),
                         ),
@@ -919,80 +1147,57 @@ def server(input, output, session):
         arb_df = arbitrage_data.get()
 
         if surf is None:
-            return ui.div(
-                {"class": "empty-state"},
-                ui.h5("No Data Available"),
-                ui.p("Please scan options first by clicking 'SCAN OPTIONS CHAIN' in the Market Data tab."),
-            )
+            return _EMPTY_SURFACE_NO_CHAIN
 
         if arb_df is None or arb_df.empty:
-            return ui.div(
-                {"class": "empty-state"},
-                ui.h5("No Arbitrage Data"),
-                ui.p("Click 'ANALYZE ARBITRAGE' in the Analysis tab to generate the surface."),
-            )
+            return _EMPTY_SURFACE_NO_ARB
+
+        return _surface_ui()
+
+    @reactive.calc
+    def _surface_ui():
+        # memoised on arbitrage_data alone, so a fresh chain scan does not
+        # re-interpolate and re-serialise an unchanged surface
+        arb_df = arbitrage_data.get()
 
         K_vals = arb_df["K"].values
         T_vals = arb_df["T"].values
         r_vals = arb_df["implied_r"].values
 
         if len(K_vals) < 3:
-            return ui.div({"class": "empty-state"}, "Insufficient data points for 3D surface. Need more strike/expiry combinations.")
+            return _EMPTY_SURFACE_SPARSE
 
-        K_unique = np.sort(np.unique(K_vals))
-        T_unique = np.sort(np.unique(T_vals))
+        K_axis, T_axis, r_binned = bin_surface(K_vals, T_vals, r_vals)
 
-        if len(K_unique) < 2 or len(T_unique) < 2:
-            return ui.div({"class": "empty-state"}, "Need at least 2 different strikes and 2 different expiries for surface plot.")
+        if len(K_axis) < 2 or len(T_axis) < 2:
+            return _EMPTY_SURFACE_FLAT
 
         K_grid, T_grid = np.meshgrid(
-            np.linspace(K_unique.min(), K_unique.max(), 30),
-            np.linspace(T_unique.min(), T_unique.max(), 30)
+            np.linspace(K_axis[0], K_axis[-1], 30),
+            np.linspace(T_axis[0], T_axis[-1], 30)
         )
 
         try:
-            r_grid = interpolate.griddata(
-                (K_vals, T_vals), r_vals, (K_grid, T_grid), method='cubic', fill_value=np.nan
-            )
+            if np.isnan(r_binned).any():
+                it, ik = np.nonzero(~np.isnan(r_binned))
+                r_grid = interpolate.griddata(
+                    (K_axis[ik], T_axis[it]), r_binned[it, ik], (K_grid, T_grid), method='cubic', fill_value=np.nan
+                )
+            else:
+                # every strike/expiry cell is populated: skip the triangulation
+                r_grid = interp_surface(K_axis, T_axis, r_binned, K_grid, T_grid)
 
             r_grid_pct = r_grid * 100
             T_grid_days = T_grid * 365
 
-            fig = go.Figure(data=[go.Surface(
-                x=K_grid,
-                y=T_grid_days,
-                z=r_grid_pct,
-                colorscale='Viridis',
-                colorbar=dict(title="Implied r, % ann")
-            )])
-
-            fig.update_traces(
-                hovertemplate='<b>Strike:</b> $%{x:.0f}<br>' +
-                              '<b>Days to Expiry:</b> %{y:.1f}<br>' +
-                              '<b>Implied r:</b> %{z:.2f}% ann<br>' +
-                              '<extra></extra>'
-            )
-
-            # Deep-blue styling for Plotly
-            fig.update_layout(
-                title="Implied Risk-Free Rate Surface",
-                scene=dict(
-                    xaxis_title="Strike Price ($)",
-                    yaxis_title="Time to Expiry (Days)",
-                    zaxis_title="Implied r, % ann",
-                    camera=dict(eye=dict(x=1.5, y=1.5, z=1.3)),
-                    xaxis=dict(tickprefix="$"),
-                    zaxis=dict(ticksuffix="%"),
-                    bgcolor="#0f1e33",
-                ),
-                template="plotly_dark",
-                paper_bgcolor="#0b1220",
-                font=dict(color="#e8eefc"),
-                height=600,
-                margin=dict(l=0, r=0, t=40, b=0)
-            )
+            with _SURFACE_FIG_LOCK:
+                surface = _SURFACE_FIG.data[0]
+                surface.x = K_grid
+                surface.y = T_grid_days
+                surface.z = r_grid_pct
+                html = _SURFACE_FIG.to_html(include_plotlyjs="cdn", full_html=False)
 
-            return ui.HTML(fig.to_html(include_plotlyjs="cdn", full_html=False))
+            return ui.HTML(html)
 
         except Exception as e:
             return ui.div({"class": "empty-state"}, f"Error creating surface plot: {str(e)}")
@@ -1,20 +1,37 @@
-function updateTimestamp() {
-    const now = new Date();
-    const timeStr = now.toLocaleTimeString('en-US', {
-        hour12: false,
-        hour: '2-digit',
-        minute: '2-digit',
-        second: '2-digit'
-    });
-    const dateStr = now.toLocaleDateString('en-US', {
-        month: 'short',
-        day: 'numeric',
-        year: 'numeric'
-    });
+// building an Intl formatter is the expensive part; do it once
+const timeFmt = new Intl.DateTimeFormat('en-US', {
+    hour12: false,
+    hour: '2-digit',
+    minute: '2-digit',
+    second: '2-digit'
+});
+const dateFmt = new Intl.DateTimeFormat('en-US', {
+    month: 'short',
+    day: 'numeric',
+    year: 'numeric'
+});
+
+document.addEventListener('DOMContentLoaded', function () {
+    // look the element up once; every tick then only writes textContent
     const el = document.getElementById('timestamp');
-    if (el) {
-        el.textContent = dateStr + ' ' + timeStr + ' EST';
+    if (!el) {
+        return;
     }
-}
-updateTimestamp();
-setInterval(updateTimestamp, 1000);
\ No newline at end of file
+
+    function updateTimestamp() {
+        const now = new Date();
+        el.textContent = dateFmt.format(now) + ' ' + timeFmt.format(now) + ' EST';
+    }
+
+    let lastTick = 0;
+    function tick(ts) {
+        // rAF stops firing on hidden tabs; the hidden check covers browsers that only throttle it
+        if (!document.hidden && ts - lastTick >= 1000) {
+            lastTick = ts;
+            updateTimestamp();
+        }
+        requestAnimationFrame(tick);
+    }
+    updateTimestamp();
+    requestAnimationFrame(tick);
+});
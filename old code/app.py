@@ -3,7 +3,11 @@
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
+import io
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import pandas as pd
 
@@ -16,6 +20,11 @@ STATIC_DIR = BASE_DIR / "static"
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 WATCH_LIST = ["AAPL", "MSFT", "NVDA", "TSLA", "SPY"]
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+
+ANALYSIS_CACHE_SIZE = 64
+_ANALYSIS_CACHE = OrderedDict()
+_ANALYSIS_LOCK = threading.Lock()
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -23,40 +32,81 @@ def home():
     return FileResponse(STATIC_DIR / "index.html")
 
 
-@app.get("/api/monitor")
-def api_monitor():
-    results = []
-
-    for symbol in WATCH_LIST:
-        print(f"\n===== Calling worker for {symbol} =====")
-
-        entry = {"symbol": symbol, "signals": [], "rows": []}
-
-        try:
-            resp = requests.get(
-                f"http://127.0.0.1:9001/fetch?symbol={symbol}",
-                timeout=10
-            )
-            print("worker http status =", resp.status_code)
-
+def _analyze_cached(symbol, df):
+    # dashboard polls mostly see an unchanged chain; hashing it is far cheaper than re-analysing
+    key = (symbol, df.shape, int(pd.util.hash_pandas_object(df, index=False).sum()))
+    with _ANALYSIS_LOCK:
+        if key in _ANALYSIS_CACHE:
+            _ANALYSIS_CACHE.move_to_end(key)
+            return _ANALYSIS_CACHE[key]
+
+    analysis = analyze_chain(df)
+
+    with _ANALYSIS_LOCK:
+        _ANALYSIS_CACHE[key] = analysis
+        if len(_ANALYSIS_CACHE) > ANALYSIS_CACHE_SIZE:
+            _ANALYSIS_CACHE.popitem(last=False)
+    return analysis
+
+
+def _fetch_spots():
+    # one batched quote request for the whole watch list instead of one per symbol
+    try:
+        resp = requests.get(
+            "http://127.0.0.1:9001/spots",
+            params={"symbols": ",".join(WATCH_LIST)},
+            timeout=10
+        )
+        spots = resp.json()
+        if spots.get("success"):
+            return spots["spots"]
+        print("ERROR in /spots:", spots.get("error"))
+    except Exception as e:
+        print("ERROR in /spots:", e)
+    return {}
+
+
+def _fetch_one(symbol, spot=None):
+    print(f"\n===== Calling worker for {symbol} =====")
+
+    entry = {"symbol": symbol, "signals": [], "rows": []}
+
+    try:
+        resp = requests.get(
+            "http://127.0.0.1:9001/fetch",
+            params={"symbol": symbol, "fmt": "arrow", "spot": spot},
+            timeout=10
+        )
+        print("worker http status =", resp.status_code)
+
+        # the chain comes back as Arrow; empty chains and errors still come back as JSON
+        if resp.headers.get("content-type", "").startswith(ARROW_MEDIA_TYPE):
+            df = pd.read_feather(io.BytesIO(resp.content))
+        else:
             worker_json = resp.json()
             print("worker_json keys:", worker_json.keys())
 
             if not worker_json.get("success"):
                 entry["error"] = worker_json.get("error")
-                results.append(entry)
-                continue
+                return entry
+
+            df = pd.DataFrame(worker_json["data"], columns=worker_json.get("columns"))
+
+        analysis = _analyze_cached(symbol, df)
+        entry.update(analysis)
 
-            raw = worker_json["data"]
-            df = pd.DataFrame(raw)
+    except Exception as e:
+        print("ERROR in /api/monitor:", e)
+        entry["error"] = str(e)
 
-            analysis = analyze_chain(df)
-            entry.update(analysis)
+    return entry
 
-        except Exception as e:
-            print("ERROR in /api/monitor:", e)
-            entry["error"] = str(e)
 
-        results.append(entry)
+@app.get("/api/monitor")
+def api_monitor():
+    # the worker calls are independent and network-bound; wait on the slowest, not the sum
+    with ThreadPoolExecutor(max_workers=len(WATCH_LIST)) as ex:
+        spots = _fetch_spots()
+        results = list(ex.map(_fetch_one, WATCH_LIST, [spots.get(s) for s in WATCH_LIST]))
 
     return {"success": True, "symbols": results}
@@ -1,23 +1,42 @@
 # src/decision_engine.py
 
 import math
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; without it the NumPy path is used
+    njit = None
+    prange = range
+
 RISK_FREE_RATE = 0.05
 THRESHOLD = 0.001   # 允许极小误差 → 保证出现 signal
 
+IMPLIED_R_CACHE = True
+
+# below this many call/put pairs the scalar formula beats array setup and kernel dispatch
+VECTORIZE_THRESHOLD = 16
+
+# single-slot memo for analyze_chain: ((id, len, first/last row, base_rate, threshold, format), result);
+# only the id is kept, never the input itself
+_last_call = None
+
+# signal code -> label; the kernels only ever write the code
+SIGNAL_LABELS = np.array([None, "Sell synthetic, buy stock", "Buy synthetic, short stock"], dtype=object)
+
+ROW_COLUMNS = ["strike", "expiry_date", "days_to_expiry", "call_mid", "put_mid", "implied_r", "signal"]
+
 
 def clean_float(x):
     """Remove NaN / inf / out-of-range numbers → return None"""
     try:
         if x is None:
             return None
-        if isinstance(x, float):
-            if math.isnan(x) or math.isinf(x):
-                return None
-        return float(x)
+        x = float(x)
+        return x if math.isfinite(x) else None
     except Exception:
         return None
 
@@ -26,79 +45,243 @@ def compute_implied_r(S, C, P, K, T):
     """
     C − P = S − K e^{-rT}
     r = -(1/T) ln( (S - (C-P)) / K )
+
+    Repeated quotes (re-running one snapshot at different thresholds) hit a small LRU keyed on
+    inputs rounded to 1e-9; set IMPLIED_R_CACHE = False when inputs won't repeat, and call
+    compute_implied_r.cache_clear() between unrelated chains.
     """
-    try:
-        if T <= 0 or K <= 0:
-            return None
+    if not IMPLIED_R_CACHE:
+        return _implied_r(S, C, P, K, T)
+    return _implied_r_cached(_quantize(S), _quantize(C), _quantize(P), _quantize(K), _quantize(T))
 
-        numerator = S - (C - P)
-        if numerator <= 0:
-            return None
 
-        r = -(1 / T) * math.log(numerator / K)
-        return clean_float(r)
+def _quantize(x):
+    return round(x, 9) if isinstance(x, float) else x
+
 
-    except:
+def _implied_r(S, C, P, K, T):
+    if not (T > 0 and K > 0):
         return None
 
+    numerator = S - (C - P)
+    if not numerator > 0:
+        return None
+
+    # the guards above leave log1p nothing to raise on
+    r = -math.log1p((numerator - K) / K) / T
+    return float(r) if math.isfinite(r) else None
+
+
+_implied_r_cached = lru_cache(maxsize=4096)(_implied_r)
+compute_implied_r.cache_clear = _implied_r_cached.cache_clear
+
+
+def _as_f64(a):
+    """
+    Contiguous float64 copy (or view) of a numeric column, as the kernels expect.
+    Upstream should keep numeric fields out of object dtype; this is where that gets paid for.
+    """
+    return np.ascontiguousarray(a, dtype=np.float64)
+
+
+def compute_implied_r_vec(S, C, P, K, T):
+    """Array form of compute_implied_r; NaN wherever the scalar version returns None."""
+    S, C, P, K, T = (_as_f64(a) for a in (S, C, P, K, T))
+    numerator = S - (C - P)
+    valid = (T > 0) & (K > 0) & (numerator > 0)
+
+    # num/K sits next to 1 for any sane quote; log1p of the excess keeps digits log(num/K) would drop
+    K_safe = np.where(valid, K, 1.0)
+    r = np.full(numerator.shape, np.nan)
+    np.log1p((numerator - K_safe) / K_safe, out=r, where=valid)
+    r = -r / np.where(valid, T, 1.0)
+    r[~np.isfinite(r)] = np.nan
+    return r
+
+
+def _classify_loop(S, C, P, K, T, base_rate, threshold):
+    """Implied r plus signal code (0 none, 1 sell, 2 buy) for each pair in a single fused loop."""
+    n = S.shape[0]
+    r_out = np.empty(n)
+    sig_out = np.zeros(n, np.int8)
+    # every pair only writes its own slot, so iterations split across threads with no locking
+    for i in prange(n):
+        num = S[i] - (C[i] - P[i])
+        if not (T[i] > 0 and K[i] > 0 and num > 0):
+            r_out[i] = np.nan
+            continue
+        r = -math.log1p((num - K[i]) / K[i]) / T[i]
+        if not math.isfinite(r):
+            r_out[i] = np.nan
+            continue
+        r_out[i] = r
+        diff = r - base_rate
+        if diff > threshold:
+            sig_out[i] = 1
+        elif diff < -threshold:
+            sig_out[i] = 2
+    return r_out, sig_out
+
 
-def analyze_chain(df, base_rate=RISK_FREE_RATE, threshold=THRESHOLD):
+# fastmath without nnan/ninf: the quotes do carry NaNs, and the validity checks above must see them.
+# The explicit signature compiles at import rather than on the first request, and cache=True
+# keeps the machine code on disk so later processes load it without invoking LLVM again.
+# parallel=True runs the prange loop on numba's thread pool; cap it with NUMBA_NUM_THREADS.
+_CLASSIFY_SIG = "Tuple((f8[::1], i1[::1]))(f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8, f8)"
+_classify_kernel = (
+    njit(_CLASSIFY_SIG, cache=True, boundscheck=False, parallel=True,
+         fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})(_classify_loop)
+    if njit is not None else None
+)
+
+
+def _implied_r_and_signal(S, C, P, K, T, base_rate, threshold):
+    if S.shape[0] < VECTORIZE_THRESHOLD:
+        quotes = zip(S.tolist(), C.tolist(), P.tolist(), K.tolist(), T.tolist())
+        r = np.array([_implied_r(*q) for q in quotes], dtype=np.float64)
+    elif _classify_kernel is not None:
+        return _classify_kernel(S, C, P, K, T, base_rate, threshold)
+    else:
+        r = compute_implied_r_vec(S, C, P, K, T)
+
+    diff = r - base_rate
+    code = np.zeros(r.shape, np.int8)
+    code[diff > threshold] = 1
+    code[diff < -threshold] = 2
+    return r, code
+
+
+def analyze_chain(df, base_rate=RISK_FREE_RATE, threshold=THRESHOLD, format="records"):
+    """
+    format="records" (default) returns rows/signals as lists of dicts, as the API has always done;
+    format="dataframe" returns them as DataFrames and skips building a dict per row.
+
+    The last call is remembered: passing the same object again, with the same length, first and
+    last row, and parameters, returns the previous result.
+    """
+    global _last_call
+    key = (id(df), 0 if df is None else len(df), _row_fingerprint(df), base_rate, threshold, format)
+    last = _last_call
+    if last is not None and last[0] == key:
+        return last[1]
+
+    result = _analyze_chain(df, base_rate, threshold, format)
+    _last_call = (key, result)
+    return result
+
+
+def _row_fingerprint(df):
+    # first and last row by value: catches in-place edits at either end and a recycled id for another chain.
+    # Compared as repr, so a missing quote (NaN) still matches itself
     if df is None or len(df) == 0:
-        return {"signals": [], "rows": [], "base_rate": base_rate, "threshold": threshold}
+        return ""
+    if isinstance(df, pd.DataFrame):
+        return repr((df.iloc[0].tolist(), df.iloc[-1].tolist()))
+    return repr((df[0], df[-1]))
+
+
+def _analyze_chain(df, base_rate, threshold, format):
+    return classify_chain(group_chain(df), base_rate, threshold, format)
 
-    df = pd.DataFrame(df)
+
+def group_chain(df):
+    """
+    Pair calls with puts and pull out the arrays classify_chain works on.
+    Nothing here depends on base_rate or threshold, so a threshold sweep groups once
+    and calls classify_chain for each value.
+    """
+    if df is None or len(df) == 0:
+        return None
+
+    # only the raw JSON records need wrapping; a frame is used as-is
+    if not isinstance(df, pd.DataFrame):
+        df = pd.DataFrame(df)
 
     # ---- Determine spot ----
     spot_col = "SPOT" if "SPOT" in df.columns else None
 
     # ---- T ----
     if "T" not in df.columns:
-        df["T"] = 30 / 365
+        df = df.assign(T=30 / 365)
 
-    strikes = sorted(df["STRIKE_PRC"].dropna().unique())
+    # split by type in one grouping pass; rows without a strike get no group
+    kind = df["OPTION_TYPE"].where(df["STRIKE_PRC"].notna())
+    by_type = dict(tuple(df.groupby(kind, sort=False)))
+    # a call only pairs with the put of the same strike *and* expiry
+    keys = ["EXPIR_DATE", "STRIKE_PRC"] if "EXPIR_DATE" in df.columns else ["STRIKE_PRC"]
+    calls = by_type.get("CALL", df.iloc[:0]).drop_duplicates(keys).set_index(keys)
+    puts = by_type.get("PUT", df.iloc[:0]).drop_duplicates(keys).set_index(keys)
+    # pair the first CALL and first PUT quoted at each key in one join; it yields each key once
+    paired = calls.join(puts["MID"].rename("PUT_MID"), how="inner")
 
-    signals = []
-    rows = []
+    if spot_col is None:
+        paired = paired.iloc[:0]
 
-    for K in strikes:
-        call = df[(df["STRIKE_PRC"] == K) & (df["OPTION_TYPE"] == "CALL")]
-        put = df[(df["STRIKE_PRC"] == K) & (df["OPTION_TYPE"] == "PUT")]
-        if call.empty or put.empty:
-            continue
+    # order by (expiry, strike) with a lexsort over int64/float64 columns instead of
+    # comparing (date, float) tuples in Python; unparseable expiries go last
+    strikes = _as_f64(paired.index.get_level_values("STRIKE_PRC"))
+    n = len(paired)
+    if "EXPIR_DATE" in keys:
+        raw_expiry = paired.index.get_level_values("EXPIR_DATE")
+        expiry = pd.to_datetime(raw_expiry, errors="coerce")
+        expiry_ns = np.where(expiry.isna(), np.iinfo(np.int64).max, expiry.asi8)
+        order = np.lexsort((strikes, expiry_ns))
+        # format the whole column in one call; a missing expiry is None, an unparseable one stays as it came
+        raw = raw_expiry.to_numpy(dtype=object, copy=True)
+        raw[raw_expiry.isna()] = None
+        expiries = np.where(expiry.isna(), raw, expiry.strftime("%Y-%m-%d").to_numpy(dtype=object))[order]
+    else:
+        order = np.argsort(strikes, kind="stable")
+        expiries = ["-"] * n
+    paired = paired.iloc[order]
 
-        C = float(call["MID"].values[0])
-        P = float(put["MID"].values[0])
-        T = float(call["T"].values[0])
-        S = float(call[spot_col].values[0]) if spot_col else None
+    return {
+        "K": strikes[order],
+        "C": _as_f64(paired["MID"]),
+        "P": _as_f64(paired["PUT_MID"]),
+        "T": _as_f64(paired["T"]),
+        "S": _as_f64(paired[spot_col]) if spot_col else np.empty(0),
+        "expiries": expiries,
+        "days": paired["T_days"].tolist() if "T_days" in paired.columns else [None] * n,
+    }
 
-        if S is None:
-            continue
 
-        r = compute_implied_r(S, C, P, K, T)
+def classify_chain(grouped, base_rate=RISK_FREE_RATE, threshold=THRESHOLD, format="records"):
+    """Implied r and signals for the output of group_chain; returns what analyze_chain does."""
+    if grouped is None:
+        if format == "dataframe":
+            empty = pd.DataFrame(columns=ROW_COLUMNS)
+            return {"signals": empty, "rows": empty, "base_rate": base_rate, "threshold": threshold}
+        return {"signals": [], "rows": [], "base_rate": base_rate, "threshold": threshold}
 
-        row = {
-            "strike": K,
-            "expiry_date": call.get("EXPIR_DATE", pd.Series(["-"])).values[0],
-            "days_to_expiry": call.get("T_days", pd.Series([None])).values[0],
-            "call_mid": C,
-            "put_mid": P,
-            "implied_r": r,
-            "signal": None,
-        }
+    K_arr, C_arr, P_arr, T_arr, S_arr = (grouped[k] for k in ("K", "C", "P", "T", "S"))
 
-        # ---- decide signal ----
-        if r is not None:
-            diff = r - base_rate
+    # ---- implied r + signal ----
+    r_arr, code = _implied_r_and_signal(S_arr, C_arr, P_arr, K_arr, T_arr, base_rate, threshold)
+    flagged = code != 0
 
-            if diff > threshold:
-                row["signal"] = "Sell synthetic, buy stock"
-            elif diff < -threshold:
-                row["signal"] = "Buy synthetic, short stock"
+    rows = pd.DataFrame({
+        "strike": K_arr,
+        "expiry_date": pd.Series(grouped["expiries"], dtype=object),
+        "days_to_expiry": grouped["days"],
+        "call_mid": C_arr,
+        "put_mid": P_arr,
+        "implied_r": r_arr,
+        "signal": pd.Series(SIGNAL_LABELS[code], dtype=object),
+    })
 
-        if row["signal"]:
-            signals.append(row)
+    if format == "dataframe":
+        return {
+            "signals": rows[flagged],
+            "rows": rows,
+            "base_rate": base_rate,
+            "threshold": threshold,
+        }
 
-        rows.append(row)
+    # JSON wants null, not NaN
+    rows["implied_r"] = pd.Series(np.where(np.isnan(r_arr), None, r_arr), dtype=object)
+    rows = rows.to_dict("records")
+    signals = [rows[i] for i in np.flatnonzero(flagged)]
 
     return {
         "signals": signals,
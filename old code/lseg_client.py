@@ -1,11 +1,23 @@
 # src/lseg_client.py
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson 可选，没有就用 requests 自带的 json 解析
+    orjson = None
 
 WORKER_URL = "http://127.0.0.1:9001/fetch"
 
+# 复用同一个连接池：轮询时不用每次都重新建 TCP 连接
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+MAX_WORKERS = 16  # 和连接池一样大，并发请求不用排队等连接
+
 
 def get_option_chain(symbol: str) -> Optional[pd.DataFrame]:
     """
@@ -13,9 +25,9 @@ def get_option_chain(symbol: str) -> Optional[pd.DataFrame]:
     转成 pandas DataFrame，给 decision_engine 用。
     """
     try:
-        resp = requests.get(WORKER_URL, params={"symbol": symbol}, timeout=10)
+        resp = _SESSION.get(WORKER_URL, params={"symbol": symbol}, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content) if orjson is not None else resp.json()
 
         if not data or not data.get("success"):
             print("Worker error:", data)
@@ -25,9 +37,21 @@ def get_option_chain(symbol: str) -> Optional[pd.DataFrame]:
         if not rows:
             return None
 
-        df = pd.DataFrame(rows)
+        # worker 按列返回 {列名: [值, ...]}，直接按列建表
+        df = pd.DataFrame(rows, columns=data.get("columns"))
         return df
 
     except Exception as e:
         print(f"Client Exception while fetching {symbol}: {e}")
         return None
+
+
+def get_option_chains(symbols: List[str]) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    同时请求多个标的的期权链，总耗时约等于最慢的那一个，而不是逐个相加。
+    返回 {symbol: DataFrame 或 None}，顺序和 symbols 一致。
+    """
+    if not symbols:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(symbols))) as ex:
+        return dict(zip(symbols, ex.map(get_option_chain, symbols)))
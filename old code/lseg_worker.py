@@ -1,90 +1,316 @@
 # src/lseg_worker.py
+import asyncio
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
+from typing import Optional
 
 import eikon as ek
+import numpy as np
 import pandas as pd
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 
-app = FastAPI()
+try:
+    import orjson
+except ImportError:  # orjson 可选，没有就用 FastAPI 默认的 json 编码
+    orjson = None
 
-# 🔑 这里填你的真实 APP KEY
-ek.set_app_key("06dbeb8bdea345b49d0e9f917a1a124250aedf25")
+app = FastAPI(default_response_class=ORJSONResponse if orjson is not None else JSONResponse)
 
+# 🔑 APP KEY 从环境变量 EIKON_APP_KEY 读，启动时设置一次（见 _start_eikon）
+APP_KEY_ENV = "EIKON_APP_KEY"
+
+# 清洗和 decision_engine 一定要用到的字段，每次都取
 FIELDS = [
     "PUTCALLIND",
     "STRIKE_PRC",
     "CF_BID",
     "CF_ASK",
-    "CF_CLOSE",
-    "IMP_VOLT",
     "EXPIR_DATE",   # 真实到期日
 ]
+# 下游没用到的字段，只有调用方用 fields=CF_CLOSE,IMP_VOLT 要了才取
+OPTIONAL_FIELDS = ["CF_CLOSE", "IMP_VOLT"]
 
+NUMERIC_COLS = ["CF_BID", "CF_ASK", "CF_CLOSE", "STRIKE_PRC", "IMP_VOLT"]
 
-@app.get("/fetch")
-def fetch(symbol: str):
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_CHUNK_ROWS = 500  # fmt="ndjson" 时每行 JSON 带多少条期权
+# 只收窄下游不参与计算的列；行权价、报价、MID、T 要原样进 analyze_chain，float32 会把 412.3 变成 412.2999877…
+NARROW_FLOAT_COLS = ["CF_CLOSE", "IMP_VOLT"]
+
+# Eikon 请求都走这个固定大小的线程池：并发数和网关能承受的对齐，线程（连同它们的连接）在请求之间复用
+EIKON_MAX_WORKERS = 8
+_EIKON_EXECUTOR = ThreadPoolExecutor(max_workers=EIKON_MAX_WORKERS, thread_name_prefix="eikon")
+
+# 同一个标的几秒内重复请求时直接用上次的 Eikon 返回，不再走网络
+EIKON_CACHE_TTL = 5  # 秒
+EIKON_CACHE_SIZE = 512
+_EIKON_CACHE = OrderedDict()
+_EIKON_LOCK = threading.Lock()
+
+# PUTCALLIND 的各种写法 → 统一的期权类型，其余值为 None
+OPTION_TYPES = {"C": "CALL", "CALL": "CALL", "P": "PUT", "PUT": "PUT"}
+
+
+def _none_if_nan(a):
+    # NaN → None，标准 json 编码才会写成 null（否则写出 NaN，不是合法 JSON）
+    out = a.astype(object)
+    out[np.isnan(a)] = None
+    return out.tolist()
+
+
+def _nullable_ints(a):
+    # 整数天数，缺失的是 null
+    out = np.full(len(a), None, dtype=object)
+    ok = ~np.isnan(a)
+    out[ok] = a[ok].astype(np.int64).tolist()
+    return out.tolist()
+
+
+def _json_columns(cols, t_days, t_years, rows=slice(None)):
+    # 按列输出（每列一个 list），不用为每一行建一个 dict，也不会每行重复一遍字段名
+    # orjson 自己把 NaN 写成 null；没有 orjson 时浮点列要先把 NaN 换成 None
+    data = {
+        c: _none_if_nan(v[rows]) if orjson is None and v.dtype.kind == "f" else v[rows].tolist()
+        for c, v in cols.items()
+    }
+    data["T_days"] = _nullable_ints(t_days[rows])
+    data["T"] = _none_if_nan(t_years[rows])
+    return data
+
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=str).encode()
+
+
+def _to_float(a):
+    # Eikon 多数时候已经给的是数值，astype 就够；有非数字字符串时才走 to_numeric
+    try:
+        return a.astype(np.float64)
+    except (ValueError, TypeError):
+        return pd.to_numeric(a, errors="coerce").astype(np.float64)
+
+
+def _narrow(df):
+    # 只有 Arrow 会把 dtype 带过去；JSON 反正都变成 Python 对象，所以只在这里收窄
+    df = df.astype({c: "float32" for c in NARROW_FLOAT_COLS if c in df.columns})
+    df["T_days"] = df["T_days"].astype("Int32")
+    df["OPTION_TYPE"] = df["OPTION_TYPE"].astype("category")
+    df["PUTCALLIND"] = df["PUTCALLIND"].astype("category")
+    return df
+
+
+def _warm_up():
+    try:
+        ek.get_data("AAPL.O", ["TRDPRC_1"])
+    except Exception as e:
+        print("Worker warm-up failed:", e)
+
+
+@app.on_event("startup")
+async def _start_eikon():
+    # 每个 worker 进程只在这里设置一次 key；没配置时直接启动失败，而不是等到第一个请求才报错
+    app_key = os.environ.get(APP_KEY_ENV)
+    if not app_key:
+        raise RuntimeError(f"Set {APP_KEY_ENV} to your Eikon app key before starting the worker")
+    ek.set_app_key(app_key)
+    # 启动时先发一次请求把到 Eikon 的连接建好，第一个真实请求不用再付握手的时间；不 await，不拖慢启动
+    asyncio.get_running_loop().run_in_executor(_EIKON_EXECUTOR, _warm_up)
+
+
+@app.on_event("shutdown")
+def _stop_eikon():
+    _EIKON_EXECUTOR.shutdown(wait=False)
+
+
+@app.get("/spots")
+def spots(symbols: str):
     """
-    对单个标的（如 AAPL）返回完整、清洗好的期权链 + 真实到期日 + T 等。
+    一次 ek.get_data 取回多个标的（逗号分隔，如 AAPL,MSFT）的现价，省掉逐个请求的往返。
     """
+    syms = [s.strip().upper() for s in symbols.split(",") if s.strip()]
     try:
-        # ---------- 1. 标的现价 ----------
-        spot_df, _ = ek.get_data(f"{symbol}.O", ["TRDPRC_1"])
-        spot = None
+        spot_df, _ = ek.get_data([f"{s}.O" for s in syms], ["TRDPRC_1"])
+        prices = {}
         if spot_df is not None and "TRDPRC_1" in spot_df.columns:
-            vals = spot_df["TRDPRC_1"].dropna().values
-            if len(vals) > 0:
-                spot = float(vals[0])
+            quoted = spot_df.dropna(subset=["TRDPRC_1"]).drop_duplicates("Instrument")
+            for ric, px in zip(quoted["Instrument"], quoted["TRDPRC_1"]):
+                prices[ric.rsplit(".", 1)[0]] = float(px)
+        return {"success": True, "spots": prices}
 
-        # ---------- 2. 期权链 ----------
-        ric = f"0#{symbol.upper()}*.U"
-        df, err = ek.get_data(ric, fields=FIELDS)
+    except Exception as e:
+        print("Worker EXCEPTION:", e)
+        return {"success": False, "error": str(e)}
 
-        if err:
-            print("Worker ERR:", err)
 
-        if df is None or df.empty:
-            return {"success": True, "symbol": symbol, "data": []}
+def _cached(kind, symbol, fn, *args):
+    key = (kind, symbol.upper(), *args)
+    now = time.monotonic()
+    with _EIKON_LOCK:
+        hit = _EIKON_CACHE.get(key)
+        if hit is not None and now - hit[0] < EIKON_CACHE_TTL:
+            return hit[1]
 
-        # ---------- 3. 清洗 ----------
-        df = df.dropna(subset=["STRIKE_PRC"], how="any")
+    value = fn(symbol, *args)
 
-        num_cols = ["CF_BID", "CF_ASK", "CF_CLOSE", "STRIKE_PRC", "IMP_VOLT"]
-        for c in num_cols:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
+    with _EIKON_LOCK:
+        _EIKON_CACHE[key] = (now, value)
+        _EIKON_CACHE.move_to_end(key)
+        if len(_EIKON_CACHE) > EIKON_CACHE_SIZE:
+            _EIKON_CACHE.popitem(last=False)
+    return value
 
-        # mid
-        df["MID"] = df[["CF_BID", "CF_ASK"]].mean(axis=1)
 
-        # 期权类型
-        df["OPTION_TYPE"] = (
-            df["PUTCALLIND"].astype(str).str.strip().str.upper().apply(
-                lambda x: "CALL" if x in ["C", "CALL"] else
-                          ("PUT" if x in ["P", "PUT"] else None)
-            )
+def _get_spot(symbol):
+    spot_df, _ = ek.get_data(f"{symbol}.O", ["TRDPRC_1"])
+    if spot_df is not None and "TRDPRC_1" in spot_df.columns:
+        vals = spot_df["TRDPRC_1"].dropna().values
+        if len(vals) > 0:
+            return float(vals[0])
+    return None
+
+
+def _get_chain(symbol, fields):
+    ric = f"0#{symbol.upper()}*.U"
+    return ek.get_data(ric, fields=list(fields))
+
+
+def _chain_response(symbol, spot, df, err, fmt):
+    if err:
+        print("Worker ERR:", err)
+
+    if df is None or df.empty:
+        return {"success": True, "symbol": symbol, "data": []}
+
+    # ---------- 3. 清洗 ----------
+    # 清洗全程在 numpy 数组上做：每列只从 DataFrame 取一次，JSON 直接按列输出，只有 Arrow 才重新建表。
+    # 缓存里的原始链只读不改。
+    # 先只转行权价：缺失或解析失败的行先去掉，其余列只处理留下来的行
+    strike = _to_float(df["STRIKE_PRC"].to_numpy())
+    keep = np.flatnonzero(~np.isnan(strike))
+    cols = {c: df[c].to_numpy()[keep] for c in df.columns}
+    cols["STRIKE_PRC"] = strike[keep]
+    n = len(keep)
+
+    for c in NUMERIC_COLS:
+        if c in cols and c != "STRIKE_PRC":
+            cols[c] = _to_float(cols[c])
+
+    # mid
+    bid = cols["CF_BID"]
+    ask = cols["CF_ASK"]
+    mid = (bid + ask) * 0.5
+    # 单边报价时和原来的 mean(axis=1) 一样取有的那一边
+    cols["MID"] = np.where(np.isnan(mid), np.fmax(bid, ask), mid)
+
+    # 期权类型
+    # 常见情况下 Eikon 给的就是干净的 "C"/"P"，两次比较就能定下来
+    is_call = cols["PUTCALLIND"] == "C"
+    is_put = cols["PUTCALLIND"] == "P"
+    if (is_call | is_put).all():
+        cols["OPTION_TYPE"] = np.where(is_call, "CALL", "PUT").astype(object)
+    else:
+        # 否则整条链也只有两三个不同的 PUTCALLIND，按类别各归一化一次，再用 codes 一次性查表
+        put_call = pd.Categorical(cols["PUTCALLIND"])
+        labels = np.array(
+            [OPTION_TYPES.get(str(c).strip().upper()) for c in put_call.categories] + [None],
+            dtype=object,
         )
+        cols["OPTION_TYPE"] = labels[put_call.codes]  # 缺失值的 code 是 -1，正好落到最后的 None
 
-        # 转到期日为日期
-        today = date.today()
-        if "EXPIR_DATE" in df.columns:
-            df["EXPIR_DATE"] = pd.to_datetime(df["EXPIR_DATE"], errors="coerce").dt.date
-            df["T_days"] = (df["EXPIR_DATE"] - today).apply(
-                lambda d: d.days if pd.notna(d) else None
-            )
-            df["T"] = df["T_days"].apply(
-                lambda x: x / 365.0 if x is not None and x > 0 else None
+    # 转到期日为日期
+    today = date.today()
+    if "EXPIR_DATE" in cols:
+        # 整条链只有几十个不同的到期日，每个只解析一次，再按 codes 铺回每一行（缺失值的 code 是 -1，落到最后的 NaT）
+        codes, uniques = pd.factorize(cols["EXPIR_DATE"])
+        try:
+            # Eikon 给的是定长的 YYYY-MM-DD，numpy 的 datetime64[D] 直接解析，比通用的 to_datetime 快
+            parsed = np.asarray(uniques, dtype=object).astype("datetime64[D]")
+        except ValueError:
+            # 有解析不了的值时才走 to_datetime，坏值记成 NaT；
+            # utc=True 让带时区和不带时区的混在一起也能解析，去掉时区后再落到 datetime64[D]
+            parsed = (
+                pd.to_datetime(uniques, errors="coerce", utc=True, cache=True)
+                .tz_localize(None)
+                .to_numpy("datetime64[D]")
             )
-        else:
-            df["T_days"] = None
-            df["T"] = None
+        expiry_d = np.append(parsed, np.datetime64("NaT", "D"))[codes]
+        cols["EXPIR_DATE"] = expiry_d.astype(object)  # datetime.date，NaT 变成 None
+        delta = expiry_d - np.datetime64(today, "D")
+        t_days = np.where(np.isnat(delta), np.nan, delta.astype(np.float64))
+        t_years = np.where(t_days > 0, t_days / 365.0, np.nan)
+    else:
+        t_days = np.full(n, np.nan)
+        t_years = np.full(n, np.nan)
+    cols["T_days"] = t_days
+    cols["T"] = t_years
+
+    # 标的现价一列
+    cols["SPOT"] = np.full(n, spot, dtype=object if spot is None else np.float64)
+
+    if fmt == "arrow":
+        out = pd.DataFrame(cols)
+        out["T_days"] = pd.array(t_days, dtype="Int64")
+        buf = io.BytesIO()
+        _narrow(out).to_feather(buf)
+        return Response(content=buf.getvalue(), media_type=ARROW_MEDIA_TYPE)
+
+    if fmt == "ndjson":
+        # 大链（SPY、QQQ 动辄上万行）分块流式输出：第一行是表头，之后每行是 NDJSON_CHUNK_ROWS 条期权的按列数据。
+        # 客户端拿到第一块就能开始解析，服务端也不用一次把整个 JSON 拼在内存里
+        def _lines():
+            yield _dumps({"success": True, "symbol": symbol, "columns": list(cols)}) + b"\n"
+            for start in range(0, n, NDJSON_CHUNK_ROWS):
+                rows = slice(start, start + NDJSON_CHUNK_ROWS)
+                yield _dumps(_json_columns(cols, t_days, t_years, rows)) + b"\n"
+
+        return StreamingResponse(_lines(), media_type=NDJSON_MEDIA_TYPE)
+
+    payload = {
+        "success": True,
+        "symbol": symbol,
+        "columns": list(cols),
+        "data": _json_columns(cols, t_days, t_years),
+    }
+    # orjson 自己认识 date 和 NaN（输出 null），直接返回 Response 可以跳过 FastAPI 逐个元素的 jsonable_encoder
+    if orjson is not None:
+        return ORJSONResponse(payload)
+    return payload
+
 
-        # 标的现价一列
-        df["SPOT"] = spot
+@app.get("/fetch")
+async def fetch(symbol: str, fmt: str = "json", spot: Optional[float] = None, fields: Optional[str] = None):
+    """
+    对单个标的（如 AAPL）返回完整、清洗好的期权链 + 真实到期日 + T 等。
+    fmt="arrow" 时直接返回 Feather（Arrow IPC）字节，出错时仍返回 JSON。
+    fmt="ndjson" 时分块流式返回：第一行表头，之后每行一块按列的数据。
+    已经从 /spots 拿到现价时可以通过 spot 传进来，跳过单独的现价请求。
+    CF_CLOSE、IMP_VOLT 默认不取，需要时用 fields（逗号分隔）要。
+    """
+    loop = asyncio.get_running_loop()
+    wanted = {f.strip().upper() for f in fields.split(",")} if fields else set()
+    chain_fields = tuple(FIELDS + [f for f in OPTIONAL_FIELDS if f in wanted])
+    try:
+        # ---------- 1 + 2. 标的现价和期权链 ----------
+        # 两次 Eikon 请求互不依赖，放到线程池里同时发，等待时间是较慢的那个而不是两者之和
+        chain = loop.run_in_executor(_EIKON_EXECUTOR, _cached, "chain", symbol, _get_chain, chain_fields)
+        if spot is None:
+            spot, (df, err) = await asyncio.gather(
+                loop.run_in_executor(_EIKON_EXECUTOR, _cached, "spot", symbol, _get_spot), chain)
+        else:
+            df, err = await chain
 
-        return {
-            "success": True,
-            "symbol": symbol,
-            "data": df.to_dict(orient="records"),
-        }
+        # 清洗是 pandas 的同步计算，也放到线程池，不占住事件循环
+        return await loop.run_in_executor(None, _chain_response, symbol, spot, df, err, fmt)
 
     except Exception as e:
         print("Worker EXCEPTION:", e)
@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pyarrow is optional; without it DataFrames are pickled like everything else
+    pyarrow = None
+
+
+class FileCache:
+    """Pickle-on-disk cache with a per-entry TTL.
+
+    Entries live under ``root/<namespace>/<md5 of key>.pkl`` next to a JSON
+    sidecar holding the write time and TTL, so expiry can be checked without
+    unpickling the payload. DataFrames are written as zstd Parquet
+    (``.parquet``) instead when pyarrow is installed.
+    """
+
+    def __init__(self, root=".cache"):
+        self.root = Path(root)
+
+    def _paths(self, key):
+        namespace = str(key[0]) if isinstance(key, tuple) and key else "default"
+        digest = hashlib.md5(repr(key).encode("utf-8")).hexdigest()
+        folder = self.root / namespace
+        return folder / digest, folder / f"{digest}.json"
+
+    def get(self, key):
+        stem, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            if time.time() - meta["ts"] > meta["ttl"]:
+                return None
+            if meta.get("fmt") == "parquet":
+                return pd.read_parquet(stem.with_suffix(".parquet"))
+            with open(stem.with_suffix(".pkl"), "rb") as f:
+                return pickle.load(f)
+        except (OSError, ValueError, KeyError, ImportError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def set(self, key, value, ttl=900):
+        stem, meta_path = self._paths(key)
+        stem.parent.mkdir(parents=True, exist_ok=True)
+
+        # write then rename, so a concurrent reader never sees half a file
+        tmp = stem.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        fmt = "pkl"
+        if pyarrow is not None and isinstance(value, pd.DataFrame):
+            try:
+                value.to_parquet(tmp, engine="pyarrow", compression="zstd")
+                fmt = "parquet"
+            except (ValueError, TypeError, pyarrow.ArrowException):
+                pass  # e.g. non-string column labels; pickle takes anything
+        if fmt == "pkl":
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, stem.with_suffix(f".{fmt}"))
+        meta_path.write_text(json.dumps({"ts": time.time(), "ttl": ttl, "fmt": fmt}))
@@ -4,11 +4,11 @@ import copy
 import pandas as pd
 import numpy as np
 
-from dataclasses import dataclass
-
-@dataclass(frozen=True)
 class ExceptionData:
-    data: str
+    __slots__ = ('data',)  # a plain slotted class builds faster than a frozen dataclass
+
+    def __init__(self, data: str):
+        self.data = data
 
 class MyException(Exception):
     def __init__(self, exception_details: ExceptionData):
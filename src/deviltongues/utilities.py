@@ -1,52 +1,91 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
 import refinitiv.data as rd
 import pandas as pd
 
 
-rd.open_session() # opens your session to refinitiv
-                  # if we figure out how to connect WITHOUT the desktop app,
-                  # then this is where we'll update the code.
-
-# Get underlying spot
-underlying_ric = "TSLA.O"
-spot_df = rd.get_data(underlying_ric, ['TR.PriceClose'])
-spot = spot_df['Price Close'].iloc[0]
-print(f"underlying spot: {spot:.2f}")
-
-# fetches options chain strikes, expiries, and RICs
-strikes_and_expiries=rd.discovery.search(
-    view = rd.discovery.Views.EQUITY_QUOTES,
-    top = 1000, # 'top' controls the max number of rows returned, 1000 is max
-    filter = "( SearchAllCategoryv2 eq 'Options' and "
-             "(ExpiryDate gt 2025-12-06 and ExpiryDate lt 2026-01-31 and "
-             "(StrikePrice ge 400 and StrikePrice le 480) and "
-             "ExchangeName xeq 'OPRA' and "
-             "(UnderlyingQuoteRIC eq 'TSLA.O')))",
-    select = "RIC,CallPutOption,StrikePrice,ExpiryDate"
-)
-# might be usful to pivot, we'll see
-# strikes_and_expiries.pivot(
-#     index=['ExpiryDate', 'StrikePrice'],
-#     columns='CallPutOption',
-#     values='RIC'
-# )
-print(strikes_and_expiries)
-
-# fetches most recent price info for each ric
-price_data = rd.get_data(
-    universe=strikes_and_expiries['RIC'].unique().tolist(),
-    fields=[
-        'CF_BID', 'CF_ASK', 'CF_LAST'
-        #,'CF_CLOSE', 'CF_HIGH','CF_LOW',
-        #'CF_VOLUME', 'CF_DATE', 'TR.OPENPRICE', 'DELTA', 'GAMMA', 'VEGA',
-        #'THETA', 'RHO', 'THEO_VALUE', 'IMP_VOLT', 'IMP_VOLTA', 'IMP_VOLTB'
-    ]
-)
-print(price_data)
+def fetch_prices_batched(rics, fields, batch=90, workers=8):
+    """rd.get_data over `rics` in slices of `batch`, sent concurrently and stacked in order."""
+    chunks = [rics[i:i + batch] for i in range(0, len(rics), batch)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        frames = list(executor.map(lambda chunk: rd.get_data(universe=chunk, fields=fields), chunks))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
 
-# Merge the price data with strikes_and_expiries
-# now have full vol surface information!
-options_surface = strikes_and_expiries.merge(
-    price_data, on='RIC', how='left'
+_SEARCH_FILTER_TMPL = (
+    "( SearchAllCategoryv2 eq 'Options' and "
+    "(ExpiryDate gt {lo} and ExpiryDate lt {hi} and "
+    "(StrikePrice ge {sl} and StrikePrice le {sh}) and "
+    "ExchangeName xeq 'OPRA' and "
+    "(UnderlyingQuoteRIC eq '{ric}')))"
 )
+_SEARCH_SELECT = "RIC,CallPutOption,StrikePrice,ExpiryDate"
+
+
+@functools.lru_cache(maxsize=32)
+def _search_options(lo, hi, sl, sh, ric):
+    """OPRA option RICs/strikes/expiries in the window; repeat windows are served from memory."""
+    return rd.discovery.search(
+        view = rd.discovery.Views.EQUITY_QUOTES,
+        top = 1000, # 'top' controls the max number of rows returned, 1000 is max
+        filter = _SEARCH_FILTER_TMPL.format(lo=lo, hi=hi, sl=sl, sh=sh, ric=ric),
+        select = _SEARCH_SELECT
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def build_tsla_vol_surface(underlying_ric="TSLA.O", expiry_lo="2025-12-06", expiry_hi="2026-01-31",
+                           strike_lo=400, strike_hi=480) -> pd.DataFrame:
+    """
+    Strikes, expiries, RICs and latest quotes for the OPRA options on `underlying_ric`
+    inside the expiry/strike window; the underlying spot is kept in `.attrs["spot"]`.
+    Results are cached per window, so treat the returned frame as read-only.
+    """
+    rd.open_session() # opens your session to refinitiv
+                      # if we figure out how to connect WITHOUT the desktop app,
+                      # then this is where we'll update the code.
+    try:
+        # Get underlying spot
+        spot_df = rd.get_data(underlying_ric, ['TR.PriceClose'])
+        spot = spot_df['Price Close'].to_numpy()[0]
+
+        # fetches options chain strikes, expiries, and RICs
+        strikes_and_expiries = _search_options(expiry_lo, expiry_hi, strike_lo, strike_hi, underlying_ric)
+        # might be usful to pivot, we'll see
+        # strikes_and_expiries.pivot(
+        #     index=['ExpiryDate', 'StrikePrice'],
+        #     columns='CallPutOption',
+        #     values='RIC'
+        # )
+
+        # fetches most recent price info for each ric
+        # (in slices of 90 so no single request is oversized or times out)
+        price_data = fetch_prices_batched(
+            list(dict.fromkeys(strikes_and_expiries['RIC'].to_numpy().tolist())),  # order-preserving dedupe
+            fields=[
+                'CF_BID', 'CF_ASK', 'CF_LAST'
+                #,'CF_CLOSE', 'CF_HIGH','CF_LOW',
+                #'CF_VOLUME', 'CF_DATE', 'TR.OPENPRICE', 'DELTA', 'GAMMA', 'VEGA',
+                #'THETA', 'RHO', 'THEO_VALUE', 'IMP_VOLT', 'IMP_VOLTA', 'IMP_VOLTB'
+            ]
+        )
+
+        # Merge the price data with strikes_and_expiries
+        # now have full vol surface information!
+        # discovery can repeat a RIC, but the quotes were fetched for the deduped list, so each RIC
+        # has at most one price row; validate checks that side only and keeps repeated search rows as before
+        options_surface = strikes_and_expiries.merge(
+            price_data, on='RIC', how='left', validate='many_to_one', sort=False
+        )
+    finally:
+        rd.close_session()
+
+    options_surface.attrs["spot"] = spot
+    return options_surface
+
 
-rd.close_session()
+if __name__ == "__main__":
+    surface = build_tsla_vol_surface()
+    print(f"underlying spot: {surface.attrs['spot']:.2f}")
+    print(surface)
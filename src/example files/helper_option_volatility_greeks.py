@@ -18,9 +18,18 @@ import \
 from plotly import subplots
 import plotly
 import time  # This is to pause our code when it needs to slow down
+import threading  # We use a semaphore to cap how many `rd.get_history` probes are in flight at once
+from concurrent.futures import ThreadPoolExecutor  # We use this to send several `rd.get_history` probes at once
+import functools  # We use `lru_cache` to avoid repeating identical searches
+from deviltongues.cache import FileCache  # We keep LSEG responses on disk, so reruns skip the network
 import numpy as np
 import refinitiv.data as rd
 
+try:
+    from numba import njit  # We use `numba` to compile the rolling statistics, when it's installed
+except ImportError:  # numba is optional; without it pandas' own rolling functions are used
+    njit = None
+
 try:
     rd.open_session(
         # For more info on the session, use `rd.get_config().as_dict()`
@@ -31,14 +40,49 @@ except:
     rd.open_session()
 
 # # ----------------------------------
-# # I'd like to 1st create a workflow that enables us to output clean errors:
+# # Responses are cached on disk, keyed by the request's parameters:
 # # ----------------------------------
-from dataclasses import dataclass
+_CACHE = FileCache(".cache")
+CACHE_TTL = 90 * 24 * 3600  # closed windows and IPA results for given inputs don't change
+LIVE_CACHE_TTL = 15 * 60  # windows that end in the future are still being filled in
+
+
+def _cached_call(key, ttl, fn, *args, **kwargs):
+    value = _CACHE.get(key)
+    if value is None:
+        value = fn(*args, **kwargs)
+        _CACHE.set(key, value, ttl=ttl)
+    return value
+
+
+# However the RIC probes below fan out (strikes x exchanges x candidate RICs),
+# no more than this many `rd.get_history` calls are sent to the session at the same time:
+HISTORY_MAX_CONCURRENCY = 8
+_HISTORY_SLOTS = threading.BoundedSemaphore(HISTORY_MAX_CONCURRENCY)
 
 
-@dataclass(frozen=True)
+def _window_ttl(end):
+    return CACHE_TTL if pd.Timestamp(end) < pd.Timestamp.now() else LIVE_CACHE_TTL
+
+
+def _historical_summaries(universe, start, end, interval, fields):
+    return rd.content.historical_pricing.summaries.Definition(
+        universe=universe,
+        start=start,
+        end=end,
+        interval=interval,
+        fields=fields
+    ).get_data().data.df
+
+
+# # ----------------------------------
+# # I'd like to 1st create a workflow that enables us to output clean errors:
+# # ----------------------------------
 class ExceptionData:
-    data: str
+    __slots__ = ('data',)  # a plain slotted class builds faster than a frozen dataclass
+
+    def __init__(self, data: str):
+        self.data = data
 
 
 class MyException(Exception):
@@ -53,8 +97,45 @@ class MyException(Exception):
 # # Now let's create helper functions in the `get_options_RIC` CLass
 # # ----------------------------------
 
+@functools.lru_cache(maxsize=256)  # The strike-range scan asks for the same `asset` once per strike probe; one search is enough.
+def _search_exchange_codes(asset):
+    response = rd.discovery.search(
+        query=asset,
+        filter="SearchAllCategory eq 'Options' and Periodicity eq 'Monthly' ",
+        select='ExchangeCode',
+        group_by="ExchangeCode")
+
+    if len(response) == 0:
+        raise (MyException(ExceptionData(
+            f"It's looking like there might not have been any trades for this option, {asset} on that date. You may want to check with: `rd.discovery.search(query = '{asset}', filter = \"SearchAllCategory eq 'Options'  and Periodicity eq 'Monthly' \", select = 'ExchangeCode', group_by = 'ExchangeCode')`")))
+
+    return tuple(response.drop_duplicates()["ExchangeCode"].to_list())
+
+
+def _as_timestamp(maturity):
+    # `get_option_ric` parses the maturity once and hands the Timestamp down; only a string pays for `pd.to_datetime`
+    return maturity if isinstance(maturity, pd.Timestamp) else pd.to_datetime(maturity)
+
+
+# option expiration month codes, indexed by `month - 1`: the expiry letter, and the call/put letters
+_EXP_LETTERS = 'ABCDEFGHIJKL'
+_MONTH_LETTERS = {'C': 'ABCDEFGHIJKL', 'P': 'MNOPQRSTUVWX'}
+
+# OPRA strikes of 10000 and up are prefixed with a letter per ten-thousand
+_OPRA_STRIKE_LETTERS = ' ABCD'
+
+
 class get_options_RIC():
 
+    # covered exchanges along with the methods to get RICs from
+    _EXCHANGE_DISPATCH = {
+        'OPQ': 'get_ric_opra',
+        'IEU': 'get_ric_ieu',
+        'EUX': 'get_ric_eurex',
+        'HKG': 'get_ric_hk',
+        'HFE': 'get_ric_hk',
+        'OSA': 'get_ric_ose'}
+
     def __init__(self):  # Constroctor
         return None
 
@@ -76,21 +157,7 @@ class get_options_RIC():
             - list[str]: The exchange codes associated with the asset.
         """
 
-        response = rd.discovery.search(
-            query=asset,
-            filter="SearchAllCategory eq 'Options' and Periodicity eq 'Monthly' ",
-            select='ExchangeCode',
-            group_by="ExchangeCode")
-
-        if len(response) == 0:
-            raise (MyException(ExceptionData(
-                f"It's looking like there might not have been any trades for this option, {asset} on that date. You may want to check with: `rd.discovery.search(query = '{asset}', filter = \"SearchAllCategory eq 'Options'  and Periodicity eq 'Monthly' \", select = 'ExchangeCode', group_by = 'ExchangeCode')`")))
-
-        exchanges = response.drop_duplicates()["ExchangeCode"].to_list()
-        exchange_codes = []
-        for exchange in exchanges:
-            exchange_codes.append(exchange)
-        return exchange_codes
+        return list(_search_exchange_codes(asset))
 
     def _get_exp_month(
             self,
@@ -99,46 +166,28 @@ class get_options_RIC():
             strike=None,
             opra=False):
 
-        maturity = pd.to_datetime(maturity)
-        # define option expiration identifiers
-        ident = {
-            '1': {'exp': 'A', 'C': 'A', 'P': 'M'},
-            '2': {'exp': 'B', 'C': 'B', 'P': 'N'},
-            '3': {'exp': 'C', 'C': 'C', 'P': 'O'},
-            '4': {'exp': 'D', 'C': 'D', 'P': 'P'},
-            '5': {'exp': 'E', 'C': 'E', 'P': 'Q'},
-            '6': {'exp': 'F', 'C': 'F', 'P': 'R'},
-            '7': {'exp': 'G', 'C': 'G', 'P': 'S'},
-            '8': {'exp': 'H', 'C': 'H', 'P': 'T'},
-            '9': {'exp': 'I', 'C': 'I', 'P': 'U'},
-            '10': {'exp': 'J', 'C': 'J', 'P': 'V'},
-            '11': {'exp': 'K', 'C': 'K', 'P': 'W'},
-            '12': {'exp': 'L', 'C': 'L', 'P': 'X'}}
+        maturity = _as_timestamp(maturity)
 
         # get expiration month code for a month
-        if opt_type.upper() == 'C':
-            exp_month = ident[str(maturity.month)]['C']
-
-        elif opt_type.upper() == 'P':
-            exp_month = ident[str(maturity.month)]['P']
+        exp_month = _MONTH_LETTERS[opt_type.upper()][maturity.month - 1]
 
         if opra and strike > 999.999:
             exp_month = exp_month.lower()
 
-        return ident, exp_month
+        return exp_month
 
-    def _check_expiry(self, ric, maturity, ident):
-        maturity = pd.to_datetime(maturity)
+    def _check_expiry(self, ric, maturity):
+        maturity = _as_timestamp(maturity)
         if maturity < datetime.now():
-            ric = ric + '^' + ident[str(maturity.month)]['exp'] + str(
-                maturity.year)[-2:]
+            ric = ric + '^' + _EXP_LETTERS[maturity.month - 1] + f"{maturity.year % 100:02d}"
         return ric
 
     def _request_prices(self, ric, debug):
         prices = []
         try:
-            prices = rd.get_history(ric,
-                                    fields=['BID', 'ASK', 'TRDPRC_1', 'SETTLE'])
+            with _HISTORY_SLOTS:
+                prices = rd.get_history(ric,
+                                        fields=['BID', 'ASK', 'TRDPRC_1', 'SETTLE'])
         except rd.errors.RDError as err:
             if debug:
                 print(f'Constructed ric {ric} -  {err}')
@@ -150,52 +199,61 @@ class get_options_RIC():
 
         return prices
 
+    def _request_prices_batch(self, rics, debug):
+        """
+        Asks `rd.get_history` for all candidate `rics` in one request and returns the first
+        (in `rics` order) that came back with prices, as `(ric, prices)`. If none did, the last
+        candidate is returned with empty `prices`, as the one-at-a-time loops used to.
+        Should the response not be split by RIC, the candidates are probed one each, concurrently.
+        """
+        history = self._request_prices(rics, debug=debug)  # `rd.get_history` takes a list of RICs too
+
+        if len(history) == 0:
+            results = [[] for ric in rics]
+        elif isinstance(history.columns, pd.MultiIndex):
+            returned = set(history.columns.get_level_values(0))
+            results = [
+                history.xs(ric, level=0, axis=1).dropna(how='all') if ric in returned else []
+                for ric in rics]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(rics), HISTORY_MAX_CONCURRENCY)) as executor:
+                results = list(executor.map(lambda ric: self._request_prices(ric, debug=debug), rics))
+
+        for ric, prices in zip(rics, results):
+            if len(prices) != 0:
+                return ric, prices
+        if debug:
+            print('RIC with specified parameters is not found')
+        return rics[-1], results[-1]
+
     def get_ric_opra(self, asset, maturity, strike, opt_type, debug):
 
-        maturity = pd.to_datetime(maturity)
+        maturity = _as_timestamp(maturity)
 
         # trim underlying asset's RIC to get the required part for option RIC
-        if asset[0] == '.':  # check if the asset is an index or an equity
+        if asset.startswith('.'):  # check if the asset is an index or an equity
             asset_name = asset[
                 1:]  # get the asset name - we remove "." symbol for index options
         else:
-            asset_name = asset.split('.')[
+            asset_name = asset.partition('.')[
                 0]  # we need only the first part of the RICs for equities
 
-        ident, exp_month = self._get_exp_month(
+        exp_month = self._get_exp_month(
             maturity=maturity, opt_type=opt_type, strike=strike, opra=True)
 
-        # get strike prrice
-        if type(strike) == float:
-            int_part = int(strike)
-            dec_part = str(str(strike).split('.')[1])
+        # get strike prrice: 3 digits + cents below 1000, 4 digits + '0' below 10000,
+        # then a letter for the ten-thousands ('A' for 1xxxx ... 'D' for 4xxxx) + the last 4 digits
+        int_part, cents = divmod(int(round(strike * 100)), 100)
+        if int_part < 1000:
+            strike_ric = f"{int_part:03d}{cents:02d}"
+        elif int_part < 10000:
+            strike_ric = f"{int_part}0"
         else:
-            int_part = int(strike)
-            dec_part = '00'
-        if len(dec_part) == 1:
-            dec_part = dec_part + '0'
-
-        if int(strike) < 10:
-            strike_ric = '00' + str(int_part) + dec_part
-        elif int_part >= 10 and int_part < 100:
-            strike_ric = '0' + str(int_part) + dec_part
-        elif int_part >= 100 and int_part < 1000:
-            strike_ric = str(int_part) + dec_part
-        elif int_part >= 1000 and int_part < 10000:
-            strike_ric = str(int_part) + '0'
-        elif int_part >= 10000 and int_part < 20000:
-            strike_ric = 'A' + str(int_part)[-4:]
-        elif int_part >= 20000 and int_part < 30000:
-            strike_ric = 'B' + str(int_part)[-4:]
-        elif int_part >= 30000 and int_part < 40000:
-            strike_ric = 'C' + str(int_part)[-4:]
-        elif int_part >= 40000 and int_part < 50000:
-            strike_ric = 'D' + str(int_part)[-4:]
+            strike_ric = _OPRA_STRIKE_LETTERS[int_part // 10000] + f"{int_part % 10000:04d}"
 
         # build ric
-        ric = asset_name + exp_month + str(maturity.day) + str(maturity.year)[
-            -2:] + strike_ric + '.U'
-        ric = self._check_expiry(ric, maturity, ident)
+        ric = asset_name + exp_month + str(maturity.day) + f"{maturity.year % 100:02d}" + strike_ric + '.U'
+        ric = self._check_expiry(ric, maturity)
 
         prices = self._request_prices(ric, debug=debug)
 
@@ -207,24 +265,24 @@ class get_options_RIC():
         return ric, prices
 
     def get_ric_hk(self, asset, maturity, strike, opt_type, debug):
-        maturity = pd.to_datetime(maturity)
+        maturity = _as_timestamp(maturity)
+        year = f"{maturity.year % 10}"  # last digit of the year, as used in the RIC
 
         # get asset name and strike price for the asset
-        if asset[0] == '.':
+        if asset.startswith('.'):
             asset_name = asset[1:]
             strike_ric = str(int(strike))
         else:
-            asset_name = asset.split('.')[0]
+            asset_name = asset.partition('.')[0]
             strike_ric = str(int(strike * 100))
 
         # get expiration month codes
-        ident, exp_month = self._get_exp_month(maturity, opt_type)
+        exp_month = self._get_exp_month(maturity, opt_type)
 
         # get rics for options on indexes. Return if valid add to the possible_rics list if no price is found
-        if asset[0] == '.':
-            ric = asset_name + strike_ric + exp_month + str(maturity.year)[
-                -1:] + '.HF'
-            ric = self._check_expiry(ric, maturity, ident)
+        if asset.startswith('.'):
+            ric = asset_name + strike_ric + exp_month + year + '.HF'
+            ric = self._check_expiry(ric, maturity)
             prices = self._request_prices(ric, debug=debug)
             if len(prices) == 0:
                 if debug:
@@ -235,163 +293,132 @@ class get_options_RIC():
             # get rics for options on equities. Return if valid add to the possible_rics list if no price is found
             # there could be several generations of options depending on the number of price adjustments due to a corporate event
             # here we use 4 adjustment opportunities.
-            for i in range(4):
-                ric = asset_name + strike_ric + str(i) + exp_month + str(
-                    maturity.year)[-1:] + '.HK'
-                ric = self._check_expiry(ric, maturity, ident)
-                prices = self._request_prices(ric, debug=debug)
-                if len(prices) == 0:
-                    if debug:
-                        print('RIC with specified parameters is not found')
-                else:
-                    return ric, prices
+            rics = [
+                self._check_expiry(
+                    asset_name + strike_ric + str(i) + exp_month + year + '.HK',
+                    maturity)
+                for i in range(4)]
+            return self._request_prices_batch(rics, debug=debug)
         return ric, prices
 
     def get_ric_ose(self, asset, maturity, strike, opt_type, debug):
 
-        maturity = pd.to_datetime(maturity)
+        maturity = _as_timestamp(maturity)
+        year = f"{maturity.year % 10}"  # last digit of the year, as used in the RIC
         strike_ric = str(strike)[:3]
-        ident, exp_month = self._get_exp_month(maturity, opt_type)
+        exp_month = self._get_exp_month(maturity, opt_type)
 
         j_nets = ['', 'L', 'R']
         generations = ['Y', 'Z', 'A', 'B', 'C']
 
-        if asset[0] == '.':
+        if asset.startswith('.'):
             index_dict = {'N225': 'JNI', 'TOPX': 'JTI'}
             # Option Root codes for indexes are different from the RIC, so we rename where necessery
-            asset_name = index_dict[asset.split('.')[1]]
+            asset_name = index_dict[asset.partition('.')[2]]
 
             # we consider also J-NET (Off-Auction(with "L")) and High  frequency (with 'R') option structures
-            for jnet in j_nets:
-                ric = asset_name + jnet + strike_ric + exp_month + str(
-                    maturity.year)[-1:] + '.OS'
-                ric = self._check_expiry(ric, maturity, ident)
-                prices = self._request_prices(ric, debug=debug)
-                if len(prices) == 0:
-                    if debug:
-                        print('RIC with specified parameters is not found')
-                else:
-                    return ric, prices
+            rics = [
+                self._check_expiry(
+                    asset_name + jnet + strike_ric + exp_month + year + '.OS',
+                    maturity)
+                for jnet in j_nets]
         else:
-            asset_name = asset.split('.')[0]
+            asset_name = asset.partition('.')[0]
             # these are generation codes similar to one from HK
-            for jnet in j_nets:
-                for gen in generations:
-                    ric = asset_name + jnet + gen + strike_ric + exp_month + str(
-                        maturity.year)[-1:] + '.OS'
-                    ric = self._check_expiry(ric, maturity, ident)
-                    prices = self._request_prices(ric, debug=debug)
-                    if len(prices) == 0:
-                        if debug:
-                            print('RIC with specified parameters is not found')
-                    else:
-                        return ric, prices
-        return ric, prices
+            rics = [
+                self._check_expiry(
+                    asset_name + jnet + gen + strike_ric + exp_month + year + '.OS',
+                    maturity)
+                for jnet in j_nets for gen in generations]
+        return self._request_prices_batch(rics, debug=debug)
 
     def get_ric_eurex(self, asset, maturity, strike, opt_type, debug):
-        maturity = pd.to_datetime(maturity)
+        maturity = _as_timestamp(maturity)
+        year = f"{maturity.year % 10}"  # last digit of the year, as used in the RIC
 
-        if asset[0] == '.':
+        if asset.startswith('.'):
             index_dict = {
                 'FTSE': 'OTUK',
                 'SSMI': 'OSMI',
                 'GDAXI': 'GDAX',
                 'ATX': 'FATXA',
                 'STOXX50E': 'STXE'}
-            asset_name = index_dict[asset.split('.')[1]]
+            asset_name = index_dict[asset.partition('.')[2]]
         else:
-            asset_name = asset.split('.')[0]
+            asset_name = asset.partition('.')[0]
 
-        ident, exp_month = self._get_exp_month(maturity, opt_type)
+        exp_month = self._get_exp_month(maturity, opt_type)
 
-        if type(strike) == float:
-            int_part = int(strike)
-            dec_part = str(str(strike).split('.')[1])[0]
-        else:
-            int_part = int(strike)
-            dec_part = '0'
-        if len(str(int(strike))) == 1:
-            strike_ric = '0' + str(int_part) + dec_part
-        else:
-            strike_ric = str(int_part) + dec_part
+        # strike with at least two integer digits, then the first decimal digit
+        int_part, cents = divmod(int(round(strike * 100)), 100)
+        strike_ric = f"{int_part:02d}{cents // 10}"
 
         generations = ['', 'a', 'b', 'c', 'd']
-        for gen in generations:
-            ric = asset_name + strike_ric + gen + exp_month + str(
-                maturity.year)[-1:] + '.EX'
-            ric = self._check_expiry(ric, maturity, ident)
-            prices = self._request_prices(ric, debug=debug)
-            if len(prices) == 0:
-                if debug:
-                    print('RIC with specified parameters is not found')
-            else:
-                return ric, prices
-        return ric, prices
+        rics = [
+            self._check_expiry(
+                asset_name + strike_ric + gen + exp_month + year + '.EX',
+                maturity)
+            for gen in generations]
+        return self._request_prices_batch(rics, debug=debug)
 
     def get_ric_ieu(self, asset, maturity, strike, opt_type, debug):
-        maturity = pd.to_datetime(maturity)
+        maturity = _as_timestamp(maturity)
+        year = f"{maturity.year % 10}"  # last digit of the year, as used in the RIC
 
-        if asset[0] == '.':
+        if asset.startswith('.'):
             index_dict = {'FTSE': 'LFE'}
-            asset_name = index_dict[asset.split('.')[1]]
+            asset_name = index_dict[asset.partition('.')[2]]
         else:
-            asset_name = asset.split('.')[0]
+            asset_name = asset.partition('.')[0]
 
-        ident, exp_month = self._get_exp_month(maturity, opt_type)
+        exp_month = self._get_exp_month(maturity, opt_type)
 
-        if len(str(int(strike))) == 2:
-            strike_ric = '0' + str(int(strike))
+        # three characters at least: the integer part zero-padded, or '0' + the single digit + the first decimal digit
+        int_part, cents = divmod(int(round(strike * 100)), 100)
+        if int_part < 10:
+            strike_ric = f"0{int_part}{cents // 10}"
         else:
-            strike_ric = str(int(strike))
-
-        if type(strike) == float and len(str(int(strike))) == 1:
-            int_part = int(strike)
-            dec_part = str(str(strike).split('.')[1])[0]
-            strike_ric = '0' + str(int_part) + dec_part
+            strike_ric = f"{int_part:03d}"
 
         generations = ['', 'a', 'b', 'c', 'd']
-        for gen in generations:
-            ric = asset_name + strike_ric + gen + exp_month + str(
-                maturity.year)[-1:] + '.L'
-            ric = self._check_expiry(ric, maturity, ident)
-            prices = self._request_prices(ric, debug=debug)
-            if len(prices) == 0:
-                if debug:
-                    print(
-                        f'Constructed {ric} RIC with specified parameters is not found')
-            else:
-                return ric, prices
-        return ric, prices
+        rics = [
+            self._check_expiry(
+                asset_name + strike_ric + gen + exp_month + year + '.L',
+                maturity)
+            for gen in generations]
+        return self._request_prices_batch(rics, debug=debug)
 
     def get_option_ric(self, asset, maturity, strike, opt_type, debug,
-                       exchange_not_supported_message_count=0):
+                       exchange_not_supported_message_count=0, max_workers=6):
 
-        # define covered exchanges along with functions to get RICs from
-        exchanges = {
-            'OPQ': self.get_ric_opra,
-            'IEU': self.get_ric_ieu,
-            'EUX': self.get_ric_eurex,
-            'HKG': self.get_ric_hk,
-            'HFE': self.get_ric_hk,
-            'OSA': self.get_ric_ose}
+        maturity = _as_timestamp(maturity)
 
         # get exchanges codes where the option on the given asset is traded
         exchnage_codes = self._get_exchange_code(asset)
         # get the list of (from all available and covered exchanges) valid rics and their prices
-        options_data = {}
-        for exch in exchnage_codes:
-            if exch in exchanges.keys():
-                ric, prices = exchanges[exch](asset, maturity, strike, opt_type,
-                                              debug)
+        # the exchanges are independent, so their probes run side by side (one at a time with `max_workers=1`)
+        frames = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for exch in exchnage_codes:
+                get_ric = self._EXCHANGE_DISPATCH.get(exch)
+                if get_ric is not None:
+                    futures[exch] = executor.submit(
+                        getattr(self, get_ric), asset, maturity, strike, opt_type, debug)
+                else:
+                    if exchange_not_supported_message_count < 1:
+                        print(f'The {exch} exchange is not supported yet')
+
+            # collected in exchange order, so the first RIC found stays the same as before
+            for exch, future in futures.items():
+                ric, prices = future.result()
                 if len(prices) != 0:
-                    options_data[ric] = prices
+                    frames.append(prices.assign(RIC=ric))
                     if debug:
                         print(
                             f'Option RIC for {exch} exchange is successfully constructed')
-            else:
-                if exchange_not_supported_message_count < 1:
-                    print(f'The {exch} exchange is not supported yet')
-        return options_data
+        # one frame of prices for all valid rics, told apart by the `RIC` column; empty if none was found
+        return pd.concat(frames) if frames else pd.DataFrame()
 
     def get_option_ric_through_strike_range(
             self,
@@ -413,6 +440,8 @@ class get_options_RIC():
             Note that if an Option at the `stike` given exist, then that will be picked, be it with `direction=None` direction="+"` or `direction="-"`.
         """
 
+        maturity = _as_timestamp(maturity)  # parsed once here rather than in every probe below
+
         if direction == "+":
             if debug:
                 print("strike lookthough direction: +")
@@ -445,31 +474,41 @@ class get_options_RIC():
             # To limit the number of 'exchange not supported' messages, if it is not supported, we will use the `exchng_not_sprted_msg_cnt` object.
             exchng_not_sprted_msg_cnt = 0
 
-            for i in range(0, range_rounded, rnge_interval):
-                if i < rnge:
-                    if len(optn_ric) == 0 and (
-                            direction == None or direction == "+"):  # Try and find an Option RIC for a Strike `interval` above the given `strike`:
-                        new_strike = (round(
-                            strike / round_to_nearest) * round_to_nearest) + i
-                        optn_ric = get_options_RIC().get_option_ric(
-                            asset=asset, maturity=maturity, opt_type=opt_type,
-                            debug=debug,
-                            strike=new_strike,
-                            exchange_not_supported_message_count=exchng_not_sprted_msg_cnt)
-                        exchng_not_sprted_msg_cnt = + 1
-                        if debug:
-                            print(f"{i} new_strike: {new_strike}")
-                    if len(optn_ric) == 0 and (
-                            direction == None or direction == "-"):  # Try and find an Option RIC for a Strike `interval` below the given `strike`:
-                        new_strike = (round(
-                            strike / round_to_nearest) * round_to_nearest) - i
-                        optn_ric = get_options_RIC().get_option_ric(
-                            asset=asset, maturity=maturity, opt_type=opt_type,
-                            debug=debug,
-                            strike=new_strike,
-                            exchange_not_supported_message_count=exchng_not_sprted_msg_cnt)
-                        if debug:
-                            print(f"{i} new_strike: {new_strike}")
+            # All candidate strikes at once, nearest first: `base + i` then `base - i` for each step `i`,
+            # the order in which they used to be tried one by one.
+            base = round(strike / round_to_nearest) * round_to_nearest
+            offsets = np.arange(0, range_rounded, rnge_interval)
+            offsets = offsets[offsets < rnge]
+            if direction == None:
+                candidates = np.column_stack([base + offsets, base - offsets]).ravel()
+            elif direction == "+":
+                candidates = base + offsets
+            else:
+                candidates = base - offsets
+            candidates = list(dict.fromkeys(candidates.tolist()))  # `base + 0` and `base - 0` are the same strike
+
+            # Probe them all concurrently, then take the nearest strike that has an Option; the probes still queued are cancelled.
+            # The strikes are already probed side by side, so each one goes through its exchanges one at a time.
+            executor = ThreadPoolExecutor(max_workers=8)
+            try:
+                futures = [
+                    executor.submit(
+                        self.get_option_ric,
+                        asset=asset, maturity=maturity, opt_type=opt_type,
+                        debug=debug,
+                        strike=candidate,
+                        exchange_not_supported_message_count=exchng_not_sprted_msg_cnt if n == 0 else 1,
+                        max_workers=1)
+                    for n, candidate in enumerate(candidates)]
+                for new_strike, future in zip(candidates, futures):
+                    optn_ric = future.result()
+                    if debug:
+                        print(f"new_strike: {new_strike}")
+                    if len(optn_ric) != 0:
+                        break
+            finally:
+                # wait for the probes already running, so none is still in flight once we return
+                executor.shutdown(wait=True, cancel_futures=True)
 
         return optn_ric, new_strike
 
@@ -478,6 +517,158 @@ class get_options_RIC():
 # # Now let's create main `IPA_Equity_Vola_n_Greeeks` CLass
 # # ----------------------------------
 
+# Fields requested from IPA for each option, shared by every instance.
+_DEFAULT_REQUEST_FIELDS = (
+    'ErrorMessage', 'AverageSoFar', 'AverageType', 'BarrierLevel', 'BarrierType',
+    'BreakEvenDeltaAmountInDealCcy', 'BreakEvenDeltaAmountInReportCcy',
+    'BreakEvenPriceInDealCcy', 'BreakEvenPriceInReportCcy', 'CallPut',
+    'CbbcOptionType', 'CbbcType', 'CharmAmountInDealCcy', 'CharmAmountInReportCcy',
+    'ColorAmountInDealCcy', 'ColorAmountInReportCcy', 'ConversionRatio',
+    'DailyVolatility', 'DailyVolatilityPercent', 'DaysToExpiry', 'DealCcy',
+    'DeltaAmountInDealCcy', 'DeltaAmountInReportCcy', 'DeltaExposureInDealCcy',
+    'DeltaExposureInReportCcy', 'DeltaHedgePositionInDealCcy',
+    'DeltaHedgePositionInReportCcy', 'DeltaPercent', 'DividendType',
+    'DividendYieldPercent', 'DvegaDtimeAmountInDealCcy',
+    'DvegaDtimeAmountInReportCcy', 'EndDate', 'ExerciseStyle', 'FixingCalendar',
+    'FixingDateArray', 'FixingEndDate', 'FixingFrequency', 'FixingNumbers',
+    'FixingStartDate', 'ForecastDividendYieldPercent', 'GammaAmountInDealCcy',
+    'GammaAmountInReportCcy', 'GammaPercent', 'Gearing', 'HedgeRatio',
+    'InstrumentCode', 'InstrumentDescription', 'InstrumentTag', 'Leverage',
+    'LotSize', 'LotsUnits', 'MarketDataDate', 'MarketValueInDealCcy',
+    'MoneynessAmountInDealCcy', 'MoneynessAmountInReportCcy', 'OptionPrice',
+    'OptionPriceSide', 'OptionTimeStamp', 'OptionType', 'PremiumOverCashInDealCcy',
+    'PremiumOverCashInReportCcy', 'PremiumOverCashPercent',
+    'PremiumPerAnnumInDealCcy', 'PremiumPerAnnumInReportCcy',
+    'PremiumPerAnnumPercent', 'PremiumPercent', 'PricingModelType',
+    'PricingModelTypeList', 'ResidualAmountInDealCcy', 'ResidualAmountInReportCcy',
+    'RhoAmountInDealCcy', 'RhoAmountInReportCcy', 'RhoPercent',
+    'RiskFreeRatePercent', 'SevenDaysThetaAmountInDealCcy',
+    'SevenDaysThetaAmountInReportCcy', 'SevenDaysThetaPercent',
+    'SpeedAmountInDealCcy', 'SpeedAmountInReportCcy', 'Strike',
+    'ThetaAmountInDealCcy', 'ThetaAmountInReportCcy', 'ThetaPercent',
+    'TimeValueInDealCcy', 'TimeValueInReportCcy', 'TimeValuePercent',
+    'TimeValuePerDay', 'TotalMarketValueInDealCcy', 'TotalMarketValueInReportCcy',
+    'UltimaAmountInDealCcy', 'UltimaAmountInReportCcy', 'UnderlyingCcy',
+    'UnderlyingPrice', 'UnderlyingPriceSide', 'UnderlyingRIC',
+    'UnderlyingTimeStamp', 'ValuationDate', 'VannaAmountInDealCcy',
+    'VannaAmountInReportCcy', 'VegaAmountInDealCcy', 'VegaAmountInReportCcy',
+    'VegaPercent', 'Volatility', 'VolatilityPercent', 'VolatilityType',
+    'VolgaAmountInDealCcy', 'VolgaAmountInReportCcy', 'YearsToExpiry',
+    'ZommaAmountInDealCcy', 'ZommaAmountInReportCcy',)
+
+
+# # ----------------------------------
+# # Rolling statistics, compiled with `numba` when it's available:
+# # ----------------------------------
+def _rolling_corr_loop(x, y, w):
+    # Pearson correlation over a trailing window of `w` rows, kept as running sums of x, y, x², y² and xy:
+    # each step adds the newest pair and takes out the oldest, instead of recomputing the whole window.
+    # Like pandas' `rolling(w).corr`, a window needs `w` rows where both x and y are set.
+    # The sums are taken around the first observed pair, so prices far from zero don't lose precision.
+    n = len(x)
+    out = np.full(n, np.nan)
+    kx = ky = 0.0
+    for i in range(n):
+        if x[i] == x[i] and y[i] == y[i]:
+            kx = x[i]
+            ky = y[i]
+            break
+    sx = sy = sxx = syy = sxy = 0.0
+    cnt = 0
+    for i in range(n):
+        xi = x[i] - kx
+        yi = y[i] - ky
+        if xi == xi and yi == yi:
+            sx += xi
+            sy += yi
+            sxx += xi * xi
+            syy += yi * yi
+            sxy += xi * yi
+            cnt += 1
+        if i >= w:
+            xo = x[i - w] - kx
+            yo = y[i - w] - ky
+            if xo == xo and yo == yo:
+                sx -= xo
+                sy -= yo
+                sxx -= xo * xo
+                syy -= yo * yo
+                sxy -= xo * yo
+                cnt -= 1
+        if cnt == w:
+            vx = sxx - sx * sx / w
+            vy = syy - sy * sy / w
+            if vx > 0.0 and vy > 0.0:
+                out[i] = (sxy - sx * sy / w) / np.sqrt(vx * vy)
+    return out
+
+
+_rolling_corr = njit(cache=True)(_rolling_corr_loop) if njit is not None else None
+
+
+def rolling_corr(x, y, w):
+    """Trailing `w`-row correlation of two aligned Series, returned as a Series on `x`'s index."""
+    if _rolling_corr is None:
+        return x.rolling(window=w).corr(y)
+    return pd.Series(
+        _rolling_corr(x.to_numpy(dtype=np.float64), y.to_numpy(dtype=np.float64), w),
+        index=x.index)
+
+
+def _rolling_std_loop(x, w, scale):
+    # Forward fill, trailing `w`-row sample standard deviation and its `scale`d copy, in one pass.
+    # As with `ffill().rolling(w).std()`, a window needs `w` set rows, so only the leading gap stays empty.
+    n = len(x)
+    std = np.full(n, np.nan)
+    scaled = np.full(n, np.nan)
+    filled = np.empty(n)
+    k = np.nan  # sums are taken around the first set value, to keep precision on large prices
+    last = np.nan
+    s = ss = 0.0
+    cnt = 0
+    for i in range(n):
+        if x[i] == x[i]:
+            last = x[i]
+            if k != k:
+                k = last
+        filled[i] = last
+        if last == last:
+            d = last - k
+            s += d
+            ss += d * d
+            cnt += 1
+        if i >= w and filled[i - w] == filled[i - w]:
+            d = filled[i - w] - k
+            s -= d
+            ss -= d * d
+            cnt -= 1
+        if cnt == w:
+            var = (ss - s * s / w) / (w - 1)
+            std[i] = np.sqrt(var) if var > 0.0 else 0.0
+            scaled[i] = std[i] * scale
+    return std, scaled
+
+
+_rolling_std = njit(cache=True)(_rolling_std_loop) if njit is not None else None
+
+
+def rolling_std(x, w, scale):
+    """`x.ffill().rolling(w).std()` and the same multiplied by `scale`, as two Series on `x`'s index."""
+    if _rolling_std is None:
+        std = x.ffill().rolling(window=w).std()
+        return std, std * scale
+    std, scaled = _rolling_std(x.to_numpy(dtype=np.float64), w, scale)
+    return pd.Series(std, index=x.index), pd.Series(scaled, index=x.index)
+
+
+# Everything `initiate`, `get_data` and `graph` assign for one strike; a cached strike restores all of it.
+_STRIKE_STATE_ATTRS = (
+    "strike", "optn_mrkt_pr_field", "df_strt_dt", "df_strt_dt_str", "df_end_dt", "df_end_dt_str",
+    "underlying_pr_field", "optn_mrkt_pr_gmt", "undrlying_optn_ric", "df_gmt", "df_gmt_no_na", "df",
+    "df_daily", "_request_fields", "rf_rate_prct", "ipa_univ_requ", "ipa_df_gmt_no_na", "df_graph", "fig",
+)
+
+
 class IPA_Equity_Vola_n_Greeeks():
 
     def __init__(
@@ -505,70 +696,12 @@ class IPA_Equity_Vola_n_Greeeks():
             # for `".SPX"`, I go with `'USDCFCFCTSA3M='`; for `".STOXX50E"`, I go with `'EURIBOR3MD='`
             rsk_free_rate_prct_field='TR.FIXINGVALUE',
             # for `".SPX"`, I go with `'TR.FIXINGVALUE'`; for `".STOXX50E"`, I go with `'TR.FIXINGVALUE'` too.
-            request_fields=['ErrorMessage', 'AverageSoFar', 'AverageType',
-                            'BarrierLevel', 'BarrierType',
-                            'BreakEvenDeltaAmountInDealCcy',
-                            'BreakEvenDeltaAmountInReportCcy',
-                            'BreakEvenPriceInDealCcy',
-                            'BreakEvenPriceInReportCcy', 'CallPut',
-                            'CbbcOptionType', 'CbbcType',
-                            'CharmAmountInDealCcy', 'CharmAmountInReportCcy',
-                            'ColorAmountInDealCcy', 'ColorAmountInReportCcy',
-                            'ConversionRatio', 'DailyVolatility',
-                            'DailyVolatilityPercent', 'DaysToExpiry', 'DealCcy',
-                            'DeltaAmountInDealCcy', 'DeltaAmountInReportCcy',
-                            'DeltaExposureInDealCcy',
-                            'DeltaExposureInReportCcy',
-                            'DeltaHedgePositionInDealCcy',
-                            'DeltaHedgePositionInReportCcy', 'DeltaPercent',
-                            'DividendType', 'DividendYieldPercent',
-                            'DvegaDtimeAmountInDealCcy',
-                            'DvegaDtimeAmountInReportCcy', 'EndDate',
-                            'ExerciseStyle', 'FixingCalendar',
-                            'FixingDateArray', 'FixingEndDate',
-                            'FixingFrequency', 'FixingNumbers',
-                            'FixingStartDate', 'ForecastDividendYieldPercent',
-                            'GammaAmountInDealCcy', 'GammaAmountInReportCcy',
-                            'GammaPercent', 'Gearing', 'HedgeRatio',
-                            'InstrumentCode', 'InstrumentDescription',
-                            'InstrumentTag', 'Leverage', 'LotSize', 'LotsUnits',
-                            'MarketDataDate', 'MarketValueInDealCcy',
-                            'MoneynessAmountInDealCcy',
-                            'MoneynessAmountInReportCcy', 'OptionPrice',
-                            'OptionPriceSide', 'OptionTimeStamp', 'OptionType',
-                            'PremiumOverCashInDealCcy',
-                            'PremiumOverCashInReportCcy',
-                            'PremiumOverCashPercent',
-                            'PremiumPerAnnumInDealCcy',
-                            'PremiumPerAnnumInReportCcy',
-                            'PremiumPerAnnumPercent', 'PremiumPercent',
-                            'PricingModelType', 'PricingModelTypeList',
-                            'ResidualAmountInDealCcy',
-                            'ResidualAmountInReportCcy', 'RhoAmountInDealCcy',
-                            'RhoAmountInReportCcy', 'RhoPercent',
-                            'RiskFreeRatePercent',
-                            'SevenDaysThetaAmountInDealCcy',
-                            'SevenDaysThetaAmountInReportCcy',
-                            'SevenDaysThetaPercent', 'SpeedAmountInDealCcy',
-                            'SpeedAmountInReportCcy', 'Strike',
-                            'ThetaAmountInDealCcy', 'ThetaAmountInReportCcy',
-                            'ThetaPercent', 'TimeValueInDealCcy',
-                            'TimeValueInReportCcy', 'TimeValuePercent',
-                            'TimeValuePerDay', 'TotalMarketValueInDealCcy',
-                            'TotalMarketValueInDealCcy',
-                            'TotalMarketValueInReportCcy',
-                            'TotalMarketValueInReportCcy',
-                            'UltimaAmountInDealCcy', 'UltimaAmountInReportCcy',
-                            'UnderlyingCcy', 'UnderlyingPrice',
-                            'UnderlyingPriceSide', 'UnderlyingRIC',
-                            'UnderlyingTimeStamp', 'ValuationDate',
-                            'VannaAmountInDealCcy', 'VannaAmountInReportCcy',
-                            'VegaAmountInDealCcy', 'VegaAmountInReportCcy',
-                            'VegaPercent', 'Volatility', 'VolatilityPercent',
-                            'VolatilityType', 'VolgaAmountInDealCcy',
-                            'VolgaAmountInReportCcy', 'YearsToExpiry',
-                            'ZommaAmountInDealCcy', 'ZommaAmountInReportCcy'],
+            request_fields=None,  # defaults to `_DEFAULT_REQUEST_FIELDS`
             search_batch_max=90,
+            ipa_max_workers=2,
+            # How many IPA batch requests may be in flight at once. IPA is rate limited per user and answers
+            # bursts above the limit with HTTP 429 (the original loop paced itself at one batch per second),
+            # so raise this only if your entitlement allows more; throttled batches are retried with backoff.
             slep=0.6,
             corr=True,
             hist_vol=True):  # Constroctor
@@ -614,11 +747,15 @@ class IPA_Equity_Vola_n_Greeeks():
         self.resample = resample
         self.rsk_free_rate_prct = rsk_free_rate_prct
         self.rsk_free_rate_prct_field = rsk_free_rate_prct_field
-        self.request_fields = request_fields
+        self.request_fields = tuple(request_fields) if request_fields is not None else _DEFAULT_REQUEST_FIELDS
         self.search_batch_max = search_batch_max
+        self.ipa_max_workers = ipa_max_workers
         self.slep = slep
         self.corr = corr
         self.hist_vol = hist_vol
+        # `cross_moneyness` results per (underlying, maturity, starting strike, option type, direction),
+        # so re-running a smile only fetches the strikes it hasn't seen yet.
+        self._strike_cache = {}
 
     def initiate(
             self,
@@ -678,8 +815,7 @@ class IPA_Equity_Vola_n_Greeeks():
                     f"Note that no Option for Strike {self.strike} was found. Instead, we use Strike {new_strike} going forward")
             self.strike = new_strike
 
-        undrlying_optn_ric = [str(i) for i in _undrlying_optn_ric.keys()][0]
-        # pd.DataFrame(_undrlying_optn_ric[undrlying_optn_ric])
+        undrlying_optn_ric = str(_undrlying_optn_ric['RIC'].iloc[0])
 
         if self.debug:
             print("\n")
@@ -691,7 +827,6 @@ class IPA_Equity_Vola_n_Greeeks():
             print("\n")
 
         maturity_dtime = pd.Timestamp(self.maturity)
-        sdate = (maturity_dtime - timedelta(900)).strftime('%Y-%m-%d')
         edate = maturity_dtime.strftime('%Y-%m-%d')
 
         # Now things are getting tricky.
@@ -711,40 +846,37 @@ class IPA_Equity_Vola_n_Greeeks():
                 print("self.option_price_side.upper())]:")
                 print(self.option_price_side.upper())
             fields_lst = [str(self.option_price_side.upper())]
-        if self.debug:
-            print(
-                f"optn_mrkt_pr_gmt = rd.content.historical_pricing.summaries.Definition(universe='{undrlying_optn_ric}',start='{sdate}',end='{edate}',interval='{self.data_retrieval_interval}',fields={fields_lst}).get_data().data.df")
-        optn_mrkt_pr_gmt = rd.content.historical_pricing.summaries.Definition(
-            universe=undrlying_optn_ric,
-            start=sdate,
-            end=edate,
-            interval=self.data_retrieval_interval,
-            fields=fields_lst
-        ).get_data().data.df
-        if 'TRDPRC_1' in optn_mrkt_pr_gmt.columns:
-            if len(optn_mrkt_pr_gmt.TRDPRC_1.dropna()) > 0:
-                optn_mrkt_pr_gmt = pd.DataFrame(
-                    data={'TRDPRC_1': optn_mrkt_pr_gmt.TRDPRC_1}).dropna()
-        elif 'SETTLE' in optn_mrkt_pr_gmt.columns:
-            if len(optn_mrkt_pr_gmt.SETTLE.dropna()) > 0:
-                optn_mrkt_pr_gmt = pd.DataFrame(
-                    data={'SETTLE': optn_mrkt_pr_gmt.SETTLE}).dropna()
-        elif 'BID' in optn_mrkt_pr_gmt.columns:
-            if len(optn_mrkt_pr_gmt.BID.dropna()) > 0:
-                optn_mrkt_pr_gmt = pd.DataFrame(
-                    data={'BID': optn_mrkt_pr_gmt.BID}).dropna()
-        else:
+        # Most options only trade for a few months before expiry, so rather than always asking for 900 days of history,
+        # we start with 180 days and only double the window (up to 900 days) while the data reaches back to its start.
+        lookback = 180
+        while True:
+            sdate = (maturity_dtime - timedelta(lookback)).strftime('%Y-%m-%d')
+            if self.debug:
+                print(
+                    f"optn_mrkt_pr_gmt = rd.content.historical_pricing.summaries.Definition(universe='{undrlying_optn_ric}',start='{sdate}',end='{edate}',interval='{self.data_retrieval_interval}',fields={fields_lst}).get_data().data.df")
+            optn_mrkt_pr_gmt = _cached_call(
+                ("historical_pricing", undrlying_optn_ric, sdate, edate, str(self.data_retrieval_interval), tuple(fields_lst)),
+                _window_ttl(edate),
+                _historical_summaries, undrlying_optn_ric, sdate, edate, self.data_retrieval_interval, fields_lst)
+            if (lookback >= 900 or optn_mrkt_pr_gmt is None or len(optn_mrkt_pr_gmt) == 0
+                    or optn_mrkt_pr_gmt.index[0] - pd.Timestamp(sdate) > timedelta(days=5)):
+                break
+            lookback = min(lookback * 2, 900)
+        # One pass over the requested fields, in priority order: keep the first one that has any data.
+        present = [fld for fld in fields_lst if fld in optn_mrkt_pr_gmt.columns]
+        counts = optn_mrkt_pr_gmt[present].notna().sum()
+        optn_mrkt_pr_field = next((fld for fld in present if counts[fld] > 0), None)
+        if optn_mrkt_pr_field is None:
             display(optn_mrkt_pr_gmt)
             raise ValueError(
                 "Issue with `optn_mrkt_pr_gmt`, as displayed above.")
+        optn_mrkt_pr_gmt = optn_mrkt_pr_gmt[[optn_mrkt_pr_field]].dropna()
         optn_mrkt_pr_gmt.columns.name = undrlying_optn_ric
 
-        column_with_fewest_nas = optn_mrkt_pr_gmt.isna().sum().idxmin()
         if self.debug:
-            print("column_with_fewest_nas:")
-            print(column_with_fewest_nas)
+            print("optn_mrkt_pr_field:")
+            print(optn_mrkt_pr_field)
 
-        optn_mrkt_pr_field = column_with_fewest_nas
         df_strt_dt = optn_mrkt_pr_gmt.index[0]
         df_strt_dt_str = df_strt_dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
         df_end_dt = optn_mrkt_pr_gmt.index[-1]
@@ -758,33 +890,20 @@ class IPA_Equity_Vola_n_Greeeks():
             print("optn_mrkt_pr_gmt 1st")
             display(optn_mrkt_pr_gmt)
 
-        undrlying_mrkt_pr_gmt = rd.content.historical_pricing.summaries.Definition(
-            universe=self.underlying,
-            start=df_strt_dt_str,
-            end=df_end_dt_str,
-            interval=self.data_retrieval_interval,
-            fields=optn_mrkt_pr_gmt.columns.array[0]
-        ).get_data().data.df
-        undrlying_mrkt_pr_gmt_cnt = undrlying_mrkt_pr_gmt.count()
+        # Only the field chosen for the option is asked for, so the response is that one column (or nothing).
+        undrlying_mrkt_pr_gmt = _cached_call(
+            ("historical_pricing", self.underlying, df_strt_dt_str, df_end_dt_str, str(self.data_retrieval_interval), (optn_mrkt_pr_field,)),
+            _window_ttl(df_end_dt_str),
+            _historical_summaries, self.underlying, df_strt_dt_str, df_end_dt_str, self.data_retrieval_interval, [optn_mrkt_pr_field])
         if self.debug:
             print("undrlying_mrkt_pr_gmt 1st")
             print(
                 f"rd.content.historical_pricing.summaries.Definition(universe='{self.underlying}', start='{df_strt_dt_str}', end='{df_end_dt_str}', interval='{self.data_retrieval_interval}', fields='{optn_mrkt_pr_gmt.columns.array[0]}').get_data().data.df")
             display(undrlying_mrkt_pr_gmt)
-        try:
-            undrlying_mrkt_pr_gmt = pd.DataFrame(
-                data={'TRDPRC_1': undrlying_mrkt_pr_gmt.TRDPRC_1}).dropna()
-        except:
-            try:
-                undrlying_mrkt_pr_gmt = pd.DataFrame(
-                    data={'SETTLE': undrlying_mrkt_pr_gmt.SETTLE}).dropna()
-            except:
-                try:
-                    undrlying_mrkt_pr_gmt = pd.DataFrame(
-                        data={'BID': undrlying_mrkt_pr_gmt.BID}).dropna()
-                except:
-                    raise ValueError(
-                        f"There seem to be no data for the field {optn_mrkt_pr_gmt.columns.array[0]}. You may want to choose the option 'Let Program Choose' as opposed to {optn_mrkt_pr_gmt.columns.array[0]}. This came from the function of `as per the function `rd.content.historical_pricing.summaries.Definition(universe='{self.underlying}', start='{df_strt_dt_str}', end='{df_end_dt_str}', interval='{self.data_retrieval_interval}', fields='{optn_mrkt_pr_gmt.columns.array[0]}').get_data().data.df`")
+        if optn_mrkt_pr_field not in undrlying_mrkt_pr_gmt.columns or undrlying_mrkt_pr_gmt[optn_mrkt_pr_field].isna().all():
+            raise ValueError(
+                f"There seem to be no data for the field {optn_mrkt_pr_gmt.columns.array[0]}. You may want to choose the option 'Let Program Choose' as opposed to {optn_mrkt_pr_gmt.columns.array[0]}. This came from the function of `as per the function `rd.content.historical_pricing.summaries.Definition(universe='{self.underlying}', start='{df_strt_dt_str}', end='{df_end_dt_str}', interval='{self.data_retrieval_interval}', fields='{optn_mrkt_pr_gmt.columns.array[0]}').get_data().data.df`")
+        undrlying_mrkt_pr_gmt = undrlying_mrkt_pr_gmt[[optn_mrkt_pr_field]].dropna()
 
         undrlying_mrkt_pr_gmt.columns.name = f"{self.underlying}"
 
@@ -801,10 +920,8 @@ class IPA_Equity_Vola_n_Greeeks():
                 inplace=True)
             df_gmt[optn_mrkt_pr_gmt.columns.array[0]] = optn_mrkt_pr_gmt
             df_gmt.columns.name = optn_mrkt_pr_gmt.columns.name
-        df_gmt.fillna(method='ffill', inplace=True)
+        df_gmt = df_gmt.ffill()
 
-        self.df_end_dt = df_end_dt
-        self.df_end_dt_str = df_end_dt_str
         self.optn_mrkt_pr_field = optn_mrkt_pr_field
         self.df_strt_dt = df_strt_dt
         self.df_strt_dt_str = df_strt_dt_str
@@ -829,35 +946,30 @@ class IPA_Equity_Vola_n_Greeeks():
             print(
                 f"rd.get_history(universe={univ}, fields={flds},start='{strt}', end='{nd}')")
 
-        while trs:
+        last_error = None
+        for attempt in range(trs):
             try:
-                trs -= 1
-                _df = rd.get_history(
-                    universe=univ,
-                    fields=flds,
-                    start=strt, end=nd)
-                trs = 0  # break, because no error
-            except Exception:  # catch all exceptions
-                time.sleep(self.slep)
-                _df = None
-
-        if self.debug:
-            print(f"_df")
-            display(_df)
-
-        if _df is None:  # If `_df` doesn't exist
-            print("\n")
-            print("Please note that the following failed:")
-            print(_df)
-            print(
-                f"rd.get_history(universe={univ}, fields={flds},start='{strt}', end='{nd}')")
-            display(
-                rd.get_history(universe=univ, fields=flds, start=strt, end=nd))
-            print(f"Please consider another instrument other than {univ}")
-            raise ValueError(
-                f"Issue with `_df`, itself taken from `rd.get_history(universe={univ}, fields={flds},start='{strt}', end='{nd}')`")
+                _df = _cached_call(
+                    ("get_history", tuple(univ), tuple(flds), strt, nd), _window_ttl(nd),
+                    rd.get_history, universe=univ, fields=flds, start=strt, end=nd)
+            except Exception as e:  # catch all exceptions
+                last_error = e
+                if attempt + 1 < trs:
+                    time.sleep(self.slep * 2 ** attempt)  # back off a little longer after each failure
+                continue
 
-        return _df
+            if self.debug:
+                print(f"_df")
+                display(_df)
+            return _df
+
+        print("\n")
+        print("Please note that the following failed:")
+        print(
+            f"rd.get_history(universe={univ}, fields={flds},start='{strt}', end='{nd}')")
+        print(f"Please consider another instrument other than {univ}")
+        raise ValueError(
+            f"Issue with `_df`, itself taken from `rd.get_history(universe={univ}, fields={flds},start='{strt}', end='{nd}')`") from last_error
 
     def get_data(self):
 
@@ -886,8 +998,9 @@ class IPA_Equity_Vola_n_Greeeks():
             display(self.optn_mrkt_pr_gmt.groupby(
                 self.optn_mrkt_pr_gmt.index.date).count().values)
 
-        if np.amax(self.optn_mrkt_pr_gmt.groupby(
-                self.optn_mrkt_pr_gmt.index.date).count().values) == 1:
+        # Bucket the timestamps by day on the int64 datetime values rather than on Python `date` objects.
+        daily_max = pd.Series(1, index=self.optn_mrkt_pr_gmt.index.floor('D')).groupby(level=0).size().max()
+        if daily_max == 1:
             raise (MyException(ExceptionData(
                 "This function only allows intraday data for now. Only interday data was returned. This may be due to illiquid Options Trading. You may want to ask only for 'Bid' or 'Ask' data as opposed to 'Let Program Choose', if you have not made that choice already, as the latter will prioritise executed trades, of which there may be few.")))
 
@@ -898,12 +1011,11 @@ class IPA_Equity_Vola_n_Greeeks():
         # Convert the index of rf_rate_prct to datetime
         rf_rate_prct.index = pd.to_datetime(rf_rate_prct.index)
 
-        # Resample rf_rate_prct to match the frequency of df_gmt, forward filling the missing values
-        rf_rate_prct_resampled = rf_rate_prct.resample('T').ffill()
-
-        # Merge the dataframes
-        merged_df = _df_gmt.merge(rf_rate_prct_resampled, left_index=True,
-                                  right_index=True, how='left')
+        # Attach the latest rate at or before each timestamp of df_gmt in one as-of join,
+        # rather than resampling rf_rate_prct to a minute grid and merging on that
+        merged_df = pd.merge_asof(
+            _df_gmt.sort_index(), rf_rate_prct.sort_index(),
+            left_index=True, right_index=True, direction='backward')
         merged_df.columns.name = self.df_gmt.columns.name
 
         if self.debug:
@@ -924,7 +1036,7 @@ class IPA_Equity_Vola_n_Greeeks():
             print("self.df_gmt 2nd")
             display(self.df_gmt)
 
-        self.df_gmt = self.df_gmt.fillna(method='ffill').fillna(method='bfill')
+        self.df_gmt = self.df_gmt.ffill().bfill()
 
         if self.debug:
             print("self.df_gmt")
@@ -944,6 +1056,15 @@ class IPA_Equity_Vola_n_Greeeks():
             print("self.df_gmt_no_na")
             display(self.df_gmt_no_na)
 
+        # Pull the per-row inputs out as plain arrays once, so the loops below only index into them
+        # (rather than a pandas `__getitem__` and a Timestamp `strftime` per row and field).
+        valuation_dates = self.df_gmt_no_na.index.strftime('%Y-%m-%dT%H:%M:%SZ').to_numpy()
+        mrkt_values = self.df_gmt_no_na[self.optn_mrkt_pr_field].to_numpy(dtype=np.float64).tolist()
+        rf_rates = self.df_gmt_no_na['RfRatePrct'].to_numpy(dtype=np.float64).tolist()
+        underlying_prices = self.df_gmt_no_na[self.underlying_pr_field].to_numpy(dtype=np.float64).tolist()
+        # The maturity is the same for every row; parse and format it once.
+        end_date_str = datetime.strptime(self.maturity, self.maturity_format).strftime('%Y-%m-%dT%H:%M:%SZ')
+
         ipa_univ_requ = [
             rd.content.ipa.financial_contracts.option.Definition(
                 strike=float(self.strike),
@@ -951,9 +1072,7 @@ class IPA_Equity_Vola_n_Greeeks():
                 underlying_type=rd.content.ipa.financial_contracts.option.UnderlyingType.ETI,
                 call_put=self.option_type,
                 exercise_style=self.exercise_style,
-                end_date=datetime.strptime(self.maturity,
-                                           self.maturity_format).strftime(
-                    '%Y-%m-%dT%H:%M:%SZ'),
+                end_date=end_date_str,
                 # '%Y-%m-%dT%H:%M:%SZ' for RD version 1.2.0 # self.maturity.strftime('%Y-%m-%dt%H:%M:%Sz') # datetime.strptime(self.maturity, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%dt%H:%M:%Sz')
                 lot_size=1,
                 deal_contract=1,
@@ -961,61 +1080,52 @@ class IPA_Equity_Vola_n_Greeeks():
                 underlying_definition=rd.content.ipa.financial_contracts.option.EtiUnderlyingDefinition(
                     instrument_code=self.underlying),
                 pricing_parameters=rd.content.ipa.financial_contracts.option.PricingParameters(
-                    valuation_date=self.df_gmt_no_na.index[i_int].strftime(
-                        '%Y-%m-%dT%H:%M:%SZ'),
+                    valuation_date=valuation_dates[i_int],
                     # '%Y-%m-%dT%H:%M:%SZ' for RD version 1.2.0 # '%Y-%m-%dt%H:%M:%Sz' # One version of rd wanted capitals, the other small. Here they are if you want to copy paste.
                     report_ccy=self.curr,
-                    market_value_in_deal_ccy=float(
-                        self.df_gmt_no_na[self.optn_mrkt_pr_field][i_int]),
+                    market_value_in_deal_ccy=mrkt_values[i_int],
                     pricing_model_type='BlackScholes',
-                    risk_free_rate_percent=float(
-                        self.df_gmt_no_na['RfRatePrct'][i_int]),
-                    underlying_price=float(
-                        self.df_gmt_no_na[self.underlying_pr_field][i_int]),
+                    risk_free_rate_percent=rf_rates[i_int],
+                    underlying_price=underlying_prices[i_int],
                     volatility_type='Implied',
                     option_price_side=self.option_price_side_for_IPA,
                     underlying_time_stamp=self.underlying_time_stamp))
             for i_int in range(len(self.df_gmt_no_na))]
 
-        ipa_univ_requ_debug = [  # For debugging.
-            {"strike": float(self.strike),
-             "buy_sell": self.buy_sell,
-             "underlying_type": rd.content.ipa.financial_contracts.option.UnderlyingType.ETI,
-             "call_put": self.option_type,
-             "exercise_style": self.exercise_style,
-             "end_date": datetime.strptime(self.maturity,
-                                           self.maturity_format).strftime(
-                 '%Y-%m-%dT%H:%M:%SZ'),
-             # '%Y-%m-%dT%H:%M:%SZ' for RD version 1.2.0 # self.maturity.strftime('%Y-%m-%dt%H:%M:%Sz') # datetime.strptime(self.maturity, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%dt%H:%M:%Sz')
-             "lot_size": 1,
-             "deal_contract": 1,
-             "time_zone_offset": 0,
-             "underlying_definition": {"instrument_code": self.underlying},
-             "pricing_parameters": {
-                 "valuation_date": self.df_gmt_no_na.index[i_int].strftime(
-                     '%Y-%m-%dT%H:%M:%SZ'),
-                 # '%Y-%m-%dT%H:%M:%SZ' for RD version 1.2.0 # '%Y-%m-%dt%H:%M:%Sz' # One version of rd wanted capitals, the other small. Here they are if you want to copy paste.
-                 "report_ccy": self.curr,
-                 "market_value_in_deal_ccy": float(
-                     self.df_gmt_no_na[self.optn_mrkt_pr_field][i_int]),  #
-                 "pricing_model_type": 'BlackScholes',
-                 "risk_free_rate_percent": float(
-                     self.df_gmt_no_na['RfRatePrct'][i_int]),
-                 "underlying_price": float(
-                     self.df_gmt_no_na[self.underlying_pr_field][i_int]),
-                 "volatility_type": 'Implied',
-                 "option_price_side": self.option_price_side_for_IPA,
-                 "underlying_time_stamp": self.underlying_time_stamp}}
-            for i_int in range(len(self.df_gmt_no_na))]
-        ipa_univ_requ_debug_buckets = [i_rdf_bd_dbg for i_rdf_bd_dbg in [
-            ipa_univ_requ_debug[j_int:j_int + self.search_batch_max] for j_int
-            in range(0, len(ipa_univ_requ_debug),
-                     self.search_batch_max)]]  # For debugging.
+        if self.debug:  # Only built when they can be displayed; they mirror `ipa_univ_requ` row for row.
+            ipa_univ_requ_debug = [  # For debugging.
+                {"strike": float(self.strike),
+                 "buy_sell": self.buy_sell,
+                 "underlying_type": rd.content.ipa.financial_contracts.option.UnderlyingType.ETI,
+                 "call_put": self.option_type,
+                 "exercise_style": self.exercise_style,
+                 "end_date": end_date_str,
+                 # '%Y-%m-%dT%H:%M:%SZ' for RD version 1.2.0 # self.maturity.strftime('%Y-%m-%dt%H:%M:%Sz') # datetime.strptime(self.maturity, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%dt%H:%M:%Sz')
+                 "lot_size": 1,
+                 "deal_contract": 1,
+                 "time_zone_offset": 0,
+                 "underlying_definition": {"instrument_code": self.underlying},
+                 "pricing_parameters": {
+                     "valuation_date": valuation_dates[i_int],
+                     # '%Y-%m-%dT%H:%M:%SZ' for RD version 1.2.0 # '%Y-%m-%dt%H:%M:%Sz' # One version of rd wanted capitals, the other small. Here they are if you want to copy paste.
+                     "report_ccy": self.curr,
+                     "market_value_in_deal_ccy": mrkt_values[i_int],  #
+                     "pricing_model_type": 'BlackScholes',
+                     "risk_free_rate_percent": rf_rates[i_int],
+                     "underlying_price": underlying_prices[i_int],
+                     "volatility_type": 'Implied',
+                     "option_price_side": self.option_price_side_for_IPA,
+                     "underlying_time_stamp": self.underlying_time_stamp}}
+                for i_int in range(len(self.df_gmt_no_na))]
+            ipa_univ_requ_debug_buckets = [i_rdf_bd_dbg for i_rdf_bd_dbg in [
+                ipa_univ_requ_debug[j_int:j_int + self.search_batch_max] for j_int
+                in range(0, len(ipa_univ_requ_debug),
+                         self.search_batch_max)]]  # For debugging.
 
         for i_str in ["ErrorMessage", "MarketValueInDealCcy",
                       "RiskFreeRatePercent", "UnderlyingPrice", "Volatility"][
             ::-1]:  # We would like to keep a minimum of these fields in the Search Responce in order to construct following graphs.
-            request_fields = [i_str] + self.request_fields
+            request_fields = [i_str, *self.request_fields]
         i_int = 0
         _request_fields = request_fields.copy()
 
@@ -1033,18 +1143,16 @@ class IPA_Equity_Vola_n_Greeeks():
             print(
                 f"There are {no_of_ipa_calls} to make. This may take a long while. If this is too long, please consider changing the `IPA_Equity_Vola_n_Greeeks` argument from {self.data_retrieval_interval} to a longer interval")
 
-        for enum, i_rdf_bd in enumerate(
-                [ipa_univ_requ[j_int:j_int + self.search_batch_max] for j_int in
-                 range(0, len(ipa_univ_requ),
-                       self.search_batch_max)]):  # This list chunks our `ipa_univ_requ` in batches of `search_batch_max`
-
+        def _ipa_call(enum, i_rdf_bd):
             # IPA may sometimes come back to us saying that Implied VOlatilities cannot be computed. This can happen sometimes due to extreme Moneyness and closeness to expiration. To investigate these issues, we create this 1st try loop:
+            # Returns the batch's data-frame and whether a retry (i.e.: the 'ErrorMessage' issue below) was needed.
             try:
                 try:  # One issue we may encounter here is that the field 'ErrorMessage' in `request_fields` may break the `get_data()` call and therefore the for loop. we may therefore have to remove 'ErrorMessage' in the call; ironically when it is most useful.
                     ipa_df_get_data_return = rd.content.ipa.financial_contracts.Definitions(
                         universe=i_rdf_bd, fields=request_fields).get_data()
+                    retried = False
                 except:  # https://stackoverflow.com/questions/11520492/difference-between-del-remove-and-pop-on-lists
-                    _request_fields.remove('ErrorMessage')
+                    retried = True
                     ipa_df_get_data_return = rd.content.ipa.financial_contracts.Definitions(
                         universe=i_rdf_bd, fields=request_fields).get_data()
             except:
@@ -1053,25 +1161,54 @@ class IPA_Equity_Vola_n_Greeeks():
                     print(request_fields)
                     print(f"ipa_univ_requ_debug_buckets[{enum}]")
                     display(ipa_univ_requ_debug_buckets[enum])
-                _request_fields.remove('ErrorMessage')
-                ipa_df_get_data_return = rd.content.ipa.financial_contracts.Definitions(
-                    universe=i_rdf_bd, fields=request_fields).get_data()
-
-            _ipa_df_gmt_no_na = ipa_df_get_data_return.data.df
-            if i_int == 0:
-                ipa_df_gmt_no_na = _ipa_df_gmt_no_na.drop("ErrorMessage",
-                                                          axis=1)  # We only keep "ErrorMessage" for debugging in self._IPA_df.
-            else:
-                ipa_df_gmt_no_na = pd.concat(
-                    [ipa_df_gmt_no_na,
-                     _ipa_df_gmt_no_na.drop(labels=["ErrorMessage"], axis=1)],
-                    ignore_index=True)
-            i_int += 1
-            time.sleep(1)
-            if self.debug:
-                print(i_int)
-            if not self.debug and no_of_ipa_calls > 100:
-                print(i_int)
+                retried = True
+                # A throttled batch (e.g.: too many in flight at once) is retried, waiting longer after each failure.
+                trs = 4
+                for attempt in range(trs):
+                    time.sleep(self.slep * 2 ** attempt)
+                    try:
+                        ipa_df_get_data_return = rd.content.ipa.financial_contracts.Definitions(
+                            universe=i_rdf_bd, fields=request_fields).get_data()
+                        break
+                    except Exception:
+                        if attempt + 1 == trs:
+                            raise
+            return ipa_df_get_data_return.data.df, retried
+
+        # An IPA batch is identified by the option's terms plus each of its rows' inputs; those answers don't change.
+        ipa_terms = (float(self.strike), self.buy_sell, self.option_type, self.exercise_style, self.maturity,
+                     self.underlying, self.curr, self.option_price_side_for_IPA, self.underlying_time_stamp,
+                     tuple(request_fields))
+        ipa_rows = list(zip(valuation_dates.tolist(), mrkt_values, rf_rates, underlying_prices))
+
+        def _ipa_call_cached(enum, i_rdf_bd):
+            key = ("ipa", ipa_terms,
+                   tuple(ipa_rows[enum * self.search_batch_max:(enum + 1) * self.search_batch_max]))
+            _ipa_df = _CACHE.get(key)
+            if _ipa_df is not None:
+                return _ipa_df, False
+            _ipa_df, retried = _ipa_call(enum, i_rdf_bd)
+            _CACHE.set(key, _ipa_df, ttl=CACHE_TTL)
+            return _ipa_df, retried
+
+        # The batches are independent, so rather than sending them one after the other with a 1 second pause in between,
+        # we send up to `ipa_max_workers` of them at a time; results come back in batch order.
+        ipa_batches = [ipa_univ_requ[j_int:j_int + self.search_batch_max] for j_int in
+                       range(0, len(ipa_univ_requ), self.search_batch_max)]  # This list chunks our `ipa_univ_requ` in batches of `search_batch_max`
+        ipa_frames = []
+        with ThreadPoolExecutor(max_workers=self.ipa_max_workers) as executor:
+            for _ipa_df_gmt_no_na, retried in executor.map(_ipa_call_cached, range(len(ipa_batches)), ipa_batches):
+                if retried and 'ErrorMessage' in _request_fields:
+                    _request_fields.remove('ErrorMessage')
+                ipa_frames.append(_ipa_df_gmt_no_na)
+                i_int += 1
+                if self.debug:
+                    print(i_int)
+                if not self.debug and no_of_ipa_calls > 100:
+                    print(i_int)
+        ipa_df_gmt_no_na = pd.concat(ipa_frames, ignore_index=True)  # one concat at the end rather than one per batch
+        # We only keep "ErrorMessage" for debugging in self._IPA_df; it goes in one column selection rather than a `drop` per batch.
+        ipa_df_gmt_no_na = ipa_df_gmt_no_na.loc[:, ipa_df_gmt_no_na.columns != "ErrorMessage"]
 
         if self.debug and len(ipa_df_gmt_no_na) > 0:
             print("ipa_df_gmt_no_na 1st:")
@@ -1087,27 +1224,26 @@ class IPA_Equity_Vola_n_Greeeks():
             warnings.simplefilter(action='ignore',
                                   category=pd.errors.PerformanceWarning)
             # Now add the new column for correnation
-            corr_df = self.df['OptionPrice'].ffill().rolling(window=63).corr(
-                self.df['Volatility'].ffill())
+            corr_df = rolling_corr(
+                self.df['OptionPrice'].ffill(), self.df['Volatility'].ffill(), 63)
             # corr_df = pd.to_numeric(self.df['OptionPrice'].ffill().rolling(window=63).corr(self.df['Volatility'].ffill()))
             self.df['3M(63WorkDay)MovCorr(StkprImpvola)'] = corr_df
         if self.hist_vol:
             # Resample data to daily frequency by taking the mean of intraday data
-            self.df_daily = self.df.select_dtypes(
-                include=[np.number]).resample(rule='B').mean()
+            # (only the two price columns are used below, so only they are resampled)
+            self.df_daily = self.df[["OptionPrice", "UnderlyingPrice"]].astype(
+                np.float64).resample(rule='B').mean()
             for i in ["OptionPrice", "UnderlyingPrice"]:
-                # Forward fill it to get rid on NAs that represent a lack of movement in price
-                self.df_daily[i] = self.df_daily[i].ffill()
-                # Calculate the Historical Volatility on a 30 day moving window and implement it in main dataframe
-                self.df_daily[f'30DHist{i}DailyVolatility'] = self.df_daily[
-                    i].rolling(window=30).std()
-                self.df_daily[f'30DHist{i}DailyVolatilityAnnualized'] = \
-                self.df_daily[f'30DHist{i}DailyVolatility'] * np.sqrt(252)
-                self.df = pd.merge_asof(
-                    self.df,
-                    self.df_daily[[f'30DHist{i}DailyVolatility',
-                                   f'30DHist{i}DailyVolatilityAnnualized']],
-                    left_index=True, right_index=True, direction='backward')
+                # Forward fill it to get rid on NAs that represent a lack of movement in price, then
+                # calculate the Historical Volatility on a 30 day moving window and implement it in main dataframe
+                # (`rolling_std` does the fill, the window and the annualisation in one pass)
+                self.df_daily[f'30DHist{i}DailyVolatility'], \
+                self.df_daily[f'30DHist{i}DailyVolatilityAnnualized'] = rolling_std(
+                    self.df_daily[i], 30, np.sqrt(252))
+                # Each intraday row takes the latest daily value at or before it; `df_daily`'s index is
+                # sorted and unique, so a forward-filling reindex does this without an as-of merge.
+                cols_out = [f'30DHist{i}DailyVolatility', f'30DHist{i}DailyVolatilityAnnualized']
+                self.df[cols_out] = self.df_daily[cols_out].reindex(self.df.index, method='ffill')
 
         self._request_fields = _request_fields
         self.rf_rate_prct = rf_rate_prct
@@ -1165,6 +1301,15 @@ class IPA_Equity_Vola_n_Greeeks():
         self.fig = fig
         return self
 
+    def _cross_moneyness_step(self, direction):
+        key = (self.underlying, self.maturity, self.strike, self.option_type, direction)
+        if key not in self._strike_cache:
+            self.initiate(direction=direction).get_data().graph()
+            self._strike_cache[key] = {a: getattr(self, a) for a in _STRIKE_STATE_ATTRS if hasattr(self, a)}
+        for attr, value in self._strike_cache[key].items():
+            setattr(self, attr, value)
+        return self
+
     def cross_moneyness(
             self,
             smile_range=4
@@ -1185,7 +1330,7 @@ class IPA_Equity_Vola_n_Greeeks():
         # Let's itterate down strikes up to the lower limit `smile_range`
         for i in range(smile_range):
             # try:
-            self.initiate(direction="-").get_data().graph()
+            self._cross_moneyness_step(direction="-")
             if self.debug:
                 print("self.strike")
                 print(self.strike)
@@ -1218,7 +1363,7 @@ class IPA_Equity_Vola_n_Greeeks():
         self.strike = self._strike + self.atm_intervals
         for i in range(smile_range):
             # try:
-            self.initiate(direction="+").get_data().graph()
+            self._cross_moneyness_step(direction="+")
             undrlying_optn_ric_lst.append(self.undrlying_optn_ric)
             strikes_lst.append(self.strike)
             df_gmt_lst.append(self.df_gmt)